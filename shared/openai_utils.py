@@ -2,55 +2,186 @@
 OpenAI utilities for AI-powered features across projects
 """
 
+import io
 import os
+import base64
+import math
+import asyncio
+import hashlib
 import logging
-from typing import List, Dict, Optional, Any
+import shelve
+from typing import List, Dict, Optional, Any, Awaitable, Tuple
 import openai
-from openai import OpenAI
+import httpx
+from openai import (
+    OpenAI,
+    AsyncOpenAI,
+    RateLimitError,
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError
+)
 import tiktoken
-from functools import wraps
+from functools import lru_cache, wraps
 import time
+from collections import OrderedDict
+import numpy as np
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Errors worth retrying; anything else (auth, bad request, not found) fails immediately
+RETRIABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+@lru_cache(maxsize=32)
+def _get_encoding(model: str):
+    """Return the (cached) tiktoken encoding for a model"""
+    return tiktoken.encoding_for_model(model)
+
+@lru_cache(maxsize=8)
+def _get_sync_client(api_key: str) -> OpenAI:
+    """Return the shared OpenAI client (and connection pool) for an API key"""
+    return OpenAI(
+        api_key=api_key,
+        http_client=httpx.Client(
+            limits=httpx.Limits(max_connections=128, max_keepalive_connections=64)
+        )
+    )
+
+# Async clients keyed by (event loop, API key). An httpx.AsyncClient's connection
+# pool is bound to the loop that first used it, so each loop gets its own client.
+_async_clients: Dict[Tuple[asyncio.AbstractEventLoop, str], AsyncOpenAI] = {}
+
+def _get_async_client(api_key: str) -> AsyncOpenAI:
+    """
+    Return the shared AsyncOpenAI client (and connection pool) for an API key
+    on the running event loop
+    
+    Must be called from a coroutine.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get((loop, api_key))
+    if client is None:
+        # Drop clients of loops that have since closed; their pools can't be reused
+        for key in [key for key in _async_clients if key[0].is_closed()]:
+            del _async_clients[key]
+        
+        client = _async_clients[(loop, api_key)] = AsyncOpenAI(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=256, max_keepalive_connections=256)
+            )
+        )
+    return client
+
+def _get_retry_delay(error: Exception, attempt: int, base_delay: float) -> float:
+    """
+    Seconds to wait before the next attempt
+    
+    Uses the server's Retry-After header when present, otherwise exponential backoff.
+    """
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass  # HTTP-date form; fall back to backoff
+    return base_delay * (2 ** attempt)
+
 class OpenAIManager:
     """
     Centralized OpenAI API management for all portfolio projects
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, embedding_cache_path: Optional[str] = None,
+                 embedding_cache_size: int = 10_000):
         """
         Initialize OpenAI client
         
         Args:
             api_key (str, optional): OpenAI API key. If None, will try to get from environment.
+            embedding_cache_path (str, optional): File used to persist embeddings across runs.
+                If None, embeddings are only cached in memory.
+            embedding_cache_size (int): Maximum embeddings kept in memory; the least
+                recently used are evicted first
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key not found. Set OPENAI_API_KEY environment variable.")
         
-        self.client = OpenAI(api_key=self.api_key)
+        # Clients are shared by every manager using the same key so connections are reused
+        # (the async client is looked up per event loop, see aclient)
+        self.client = _get_sync_client(self.api_key)
         self.default_model = "gpt-4"
         self.max_retries = 3
         self.retry_delay = 1
+        self.max_concurrency = 50  # Concurrent async requests; keep under the org's rate limit
+        
+        # In-memory LRU embedding cache keyed by model + SHA-256 of the text
+        self._emb_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._emb_cache_size = embedding_cache_size
+        self._persistent_cache_path = embedding_cache_path
+        self._persistent_cache = None
+        self.embedding_cache_hits = 0
+        self.embedding_cache_misses = 0
+    
+    @property
+    def aclient(self) -> AsyncOpenAI:
+        """Async client for the running event loop (only available inside a coroutine)"""
+        return _get_async_client(self.api_key)
     
     def retry_on_failure(func):
-        """Decorator for retrying API calls on failure"""
+        """Decorator for retrying API calls on transient failures"""
         @wraps(func)
         def wrapper(self, *args, **kwargs):
             for attempt in range(self.max_retries):
                 try:
                     return func(self, *args, **kwargs)
-                except Exception as e:
+                except RETRIABLE_ERRORS as e:
+                    if attempt == self.max_retries - 1:
+                        logger.error(f"API call failed after {self.max_retries} attempts: {e}")
+                        raise
+                    logger.warning(f"API call failed (attempt {attempt + 1}), retrying: {e}")
+                    time.sleep(_get_retry_delay(e, attempt, self.retry_delay))
+            return None
+        return wrapper
+    
+    def async_retry_on_failure(func):
+        """Decorator for retrying async API calls on transient failures"""
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            for attempt in range(self.max_retries):
+                try:
+                    return await func(self, *args, **kwargs)
+                except RETRIABLE_ERRORS as e:
                     if attempt == self.max_retries - 1:
                         logger.error(f"API call failed after {self.max_retries} attempts: {e}")
                         raise
                     logger.warning(f"API call failed (attempt {attempt + 1}), retrying: {e}")
-                    time.sleep(self.retry_delay * (2 ** attempt))  # Exponential backoff
+                    await asyncio.sleep(_get_retry_delay(e, attempt, self.retry_delay))
             return None
         return wrapper
     
+    async def _gather(self, coros: List[Awaitable[Any]], concurrency: Optional[int] = None) -> List[Any]:
+        """
+        Run coroutines concurrently with at most `concurrency` in flight
+        
+        Args:
+            coros (List[Awaitable]): Coroutines to run
+            concurrency (int, optional): Concurrency cap (defaults to max_concurrency)
+            
+        Returns:
+            List[Any]: Results in the same order as coros
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.max_concurrency)
+        
+        async def run(coro):
+            async with semaphore:
+                return await coro
+        
+        return await asyncio.gather(*[run(coro) for coro in coros])
+    
     @retry_on_failure
     def chat_completion(
         self,
@@ -88,6 +219,65 @@ class OpenAIManager:
             logger.error(f"Chat completion failed: {e}")
             raise
     
+    @async_retry_on_failure
+    async def achat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """
+        Async version of chat_completion
+        
+        Args:
+            messages (List[Dict]): Conversation messages
+            model (str, optional): Model to use (defaults to gpt-4)
+            temperature (float): Sampling temperature
+            max_tokens (int, optional): Maximum tokens to generate
+            **kwargs: Additional parameters for the API call
+            
+        Returns:
+            str: Generated response
+        """
+        try:
+            response = await self.aclient.chat.completions.create(
+                model=model or self.default_model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs
+            )
+            
+            return response.choices[0].message.content
+            
+        except Exception as e:
+            logger.error(f"Chat completion failed: {e}")
+            raise
+    
+    async def achat_batch(
+        self,
+        messages_list: List[List[Dict[str, str]]],
+        concurrency: Optional[int] = None,
+        **kwargs
+    ) -> List[str]:
+        """
+        Run many chat completions concurrently
+        
+        Args:
+            messages_list (List[List[Dict]]): One conversation per completion
+            concurrency (int, optional): Maximum requests in flight (defaults to max_concurrency)
+            **kwargs: Additional parameters passed to achat_completion
+            
+        Returns:
+            List[str]: Generated responses, in the same order as messages_list
+        """
+        return await self._gather(
+            [self.achat_completion(messages, **kwargs) for messages in messages_list],
+            concurrency
+        )
+    
     @retry_on_failure
     def analyze_image(
         self,
@@ -134,34 +324,307 @@ class OpenAIManager:
             logger.error(f"Image analysis failed: {e}")
             raise
     
-    @retry_on_failure
     def generate_embeddings(
         self,
         texts: List[str],
-        model: str = "text-embedding-ada-002"
-    ) -> List[List[float]]:
+        model: str = "text-embedding-ada-002",
+        max_batch_tokens: int = 280_000,
+        max_batch_items: int = 2048,
+        normalize: bool = False
+    ) -> np.ndarray:
         """
         Generate embeddings for text inputs
         
+        Texts are packed into as few requests as possible while staying under
+        the per-request token and input-count limits of the embeddings API.
+        
         Args:
             texts (List[str]): List of texts to embed
             model (str): Embedding model to use
+            max_batch_tokens (int): Estimated token budget per request
+            max_batch_items (int): Maximum number of inputs per request
+            normalize (bool): Scale rows to unit length so cosine similarity is a dot product
             
         Returns:
-            List[List[float]]: List of embedding vectors
+            np.ndarray: float32 matrix of shape (len(texts), dim), rows in input order.
+                Use .tolist() where plain lists are needed.
+        """
+        embeddings, pending = self._lookup_embeddings(texts, model)
+        
+        if pending:
+            uncached_texts = [texts[indices[0]] for indices in pending.values()]
+            results = []
+            for batch in self._pack_embedding_batches(uncached_texts, max_batch_tokens, max_batch_items):
+                results.extend(self._create_embeddings(batch, model))
+            self._fill_embeddings(embeddings, pending, results)
+        
+        return self._to_matrix(embeddings, normalize)
+    
+    async def agenerate_embeddings(
+        self,
+        texts: List[str],
+        model: str = "text-embedding-ada-002",
+        max_batch_tokens: int = 280_000,
+        max_batch_items: int = 2048,
+        concurrency: Optional[int] = None,
+        normalize: bool = False
+    ) -> np.ndarray:
+        """
+        Async version of generate_embeddings that sends sub-batches concurrently
+        
+        Args:
+            texts (List[str]): List of texts to embed
+            model (str): Embedding model to use
+            max_batch_tokens (int): Estimated token budget per request
+            max_batch_items (int): Maximum number of inputs per request
+            concurrency (int, optional): Maximum requests in flight (defaults to max_concurrency)
+            normalize (bool): Scale rows to unit length so cosine similarity is a dot product
+            
+        Returns:
+            np.ndarray: float32 matrix of shape (len(texts), dim), rows in input order
+        """
+        embeddings, pending = self._lookup_embeddings(texts, model)
+        
+        if pending:
+            uncached_texts = [texts[indices[0]] for indices in pending.values()]
+            batches = self._pack_embedding_batches(uncached_texts, max_batch_tokens, max_batch_items)
+            batch_results = await self._gather(
+                [self._acreate_embeddings(batch, model) for batch in batches],
+                concurrency
+            )
+            results = [embedding for batch_result in batch_results for embedding in batch_result]
+            self._fill_embeddings(embeddings, pending, results)
+        
+        return self._to_matrix(embeddings, normalize)
+    
+    def _lookup_embeddings(
+        self,
+        texts: List[str],
+        model: str
+    ) -> Tuple[List[Optional[np.ndarray]], Dict[str, List[int]]]:
+        """
+        Resolve texts against the embedding cache
+        
+        Args:
+            texts (List[str]): Texts to embed
+            model (str): Embedding model to use
+            
+        Returns:
+            tuple: (embeddings with None for misses, cache key -> indices of each distinct miss)
+        """
+        keys = [self._embedding_cache_key(text, model) for text in texts]
+        embeddings = [self._get_cached_embedding(key) for key in keys]
+        
+        # Only send texts we have not embedded before (each distinct text once)
+        pending: Dict[str, List[int]] = {}
+        for i, (key, embedding) in enumerate(zip(keys, embeddings)):
+            if embedding is None:
+                pending.setdefault(key, []).append(i)
+        
+        misses = sum(len(indices) for indices in pending.values())
+        self.embedding_cache_hits += len(texts) - misses
+        self.embedding_cache_misses += misses
+        
+        return embeddings, pending
+    
+    def _fill_embeddings(
+        self,
+        embeddings: List[Optional[np.ndarray]],
+        pending: Dict[str, List[int]],
+        results: List[np.ndarray]
+    ):
+        """Cache freshly generated embeddings and place them at their input positions"""
+        for (key, indices), embedding in zip(pending.items(), results):
+            self._store_embedding(key, embedding)
+            for i in indices:
+                embeddings[i] = embedding
+    
+    @staticmethod
+    def _to_matrix(embeddings: List[np.ndarray], normalize: bool = False) -> np.ndarray:
+        """
+        Pack embedding vectors into one contiguous float32 matrix
+        
+        Args:
+            embeddings (List[np.ndarray]): Embedding vectors of equal length
+            normalize (bool): Scale rows to unit L2 norm in place
+            
+        Returns:
+            np.ndarray: Matrix of shape (len(embeddings), dim)
+        """
+        dim = len(embeddings[0]) if embeddings else 0
+        matrix = np.empty((len(embeddings), dim), dtype=np.float32)
+        for i, embedding in enumerate(embeddings):
+            matrix[i] = embedding
+        
+        if normalize:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1
+            matrix /= norms
+        
+        return matrix
+    
+    @retry_on_failure
+    def _create_embeddings(self, texts: List[str], model: str) -> List[np.ndarray]:
+        """
+        Embed a single sub-batch of texts with one API request
+        
+        Args:
+            texts (List[str]): Texts that fit within one request
+            model (str): Embedding model to use
+            
+        Returns:
+            List[np.ndarray]: float32 embedding vectors for the sub-batch
         """
         try:
             response = self.client.embeddings.create(
                 model=model,
-                input=texts
+                input=texts,
+                encoding_format="base64"
             )
             
-            return [embedding.embedding for embedding in response.data]
+            return [self._decode_embedding(embedding.embedding) for embedding in response.data]
             
         except Exception as e:
             logger.error(f"Embedding generation failed: {e}")
             raise
     
+    @async_retry_on_failure
+    async def _acreate_embeddings(self, texts: List[str], model: str) -> List[np.ndarray]:
+        """Async version of _create_embeddings"""
+        try:
+            response = await self.aclient.embeddings.create(
+                model=model,
+                input=texts,
+                encoding_format="base64"
+            )
+            
+            return [self._decode_embedding(embedding.embedding) for embedding in response.data]
+            
+        except Exception as e:
+            logger.error(f"Embedding generation failed: {e}")
+            raise
+    
+    @staticmethod
+    def _decode_embedding(data: str) -> np.ndarray:
+        """Decode a base64-encoded embedding into a float32 vector"""
+        return np.frombuffer(base64.b64decode(data), dtype=np.float32)
+    
+    @staticmethod
+    def _pack_embedding_batches(
+        texts: List[str],
+        max_batch_tokens: int,
+        max_batch_items: int
+    ) -> List[List[str]]:
+        """
+        Greedily pack texts into sub-batches under the token and item limits
+        
+        Args:
+            texts (List[str]): Texts to pack, kept in their original order
+            max_batch_tokens (int): Estimated token budget per sub-batch
+            max_batch_items (int): Maximum number of texts per sub-batch
+            
+        Returns:
+            List[List[str]]: Sub-batches whose concatenation equals texts
+        """
+        batches = []
+        batch = []
+        batch_tokens = 0
+        
+        for text in texts:
+            # Byte-based estimate (~4 bytes per token) avoids running the tokenizer
+            tokens = math.ceil(len(text.encode("utf-8")) / 4)
+            
+            if batch and (batch_tokens + tokens > max_batch_tokens or len(batch) >= max_batch_items):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            
+            batch.append(text)
+            batch_tokens += tokens
+        
+        if batch:
+            batches.append(batch)
+        
+        return batches
+    
+    @staticmethod
+    def _embedding_cache_key(text: str, model: str) -> str:
+        """Build the cache key for a text embedded with a given model"""
+        return f"{model}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+    
+    def _get_persistent_cache(self):
+        """Lazily open the on-disk embedding cache, if one is configured"""
+        if self._persistent_cache is None and self._persistent_cache_path:
+            self._persistent_cache = shelve.open(self._persistent_cache_path, writeback=False)
+        return self._persistent_cache
+    
+    def _get_cached_embedding(self, key: str) -> Optional[np.ndarray]:
+        """Look up an embedding in memory, then on disk"""
+        embedding = self._emb_cache.get(key)
+        if embedding is not None:
+            self._emb_cache.move_to_end(key)
+        else:
+            persistent_cache = self._get_persistent_cache()
+            if persistent_cache is not None:
+                embedding = persistent_cache.get(key)
+                if embedding is not None:
+                    self._remember_embedding(key, embedding)
+        return embedding
+    
+    def _remember_embedding(self, key: str, embedding: np.ndarray):
+        """Add an embedding to the in-memory cache, evicting the least recently used"""
+        self._emb_cache[key] = embedding
+        self._emb_cache.move_to_end(key)
+        while len(self._emb_cache) > self._emb_cache_size:
+            self._emb_cache.popitem(last=False)
+    
+    def _store_embedding(self, key: str, embedding: np.ndarray):
+        """Write an embedding to the in-memory and on-disk caches"""
+        self._remember_embedding(key, embedding)
+        persistent_cache = self._get_persistent_cache()
+        if persistent_cache is not None:
+            persistent_cache[key] = embedding
+    
+    def close(self):
+        """Flush and close the on-disk embedding cache, if it was opened"""
+        if self._persistent_cache is not None:
+            self._persistent_cache.close()
+            self._persistent_cache = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def clear_embedding_cache(self, persistent: bool = False):
+        """
+        Clear cached embeddings and reset cache statistics
+        
+        Args:
+            persistent (bool): Also clear the on-disk cache
+        """
+        self._emb_cache.clear()
+        if persistent:
+            persistent_cache = self._get_persistent_cache()
+            if persistent_cache is not None:
+                persistent_cache.clear()
+        self.embedding_cache_hits = 0
+        self.embedding_cache_misses = 0
+    
+    def get_embedding_cache_stats(self) -> Dict[str, int]:
+        """
+        Get embedding cache statistics
+        
+        Returns:
+            Dict[str, int]: Hit/miss counts and number of in-memory entries
+        """
+        return {
+            'hits': self.embedding_cache_hits,
+            'misses': self.embedding_cache_misses,
+            'size': len(self._emb_cache)
+        }
+    
     def count_tokens(self, text: str, model: str = "gpt-4") -> int:
         """
         Count tokens in text for a specific model
@@ -174,8 +637,7 @@ class OpenAIManager:
             int: Number of tokens
         """
         try:
-            encoding = tiktoken.encoding_for_model(model)
-            return len(encoding.encode(text))
+            return len(_get_encoding(model).encode(text))
         except Exception as e:
             logger.warning(f"Token counting failed, using approximation: {e}")
             return len(text.split()) * 1.3  # Rough approximation
@@ -246,10 +708,12 @@ class PromptTemplates:
     @staticmethod
     def format_product_recommendation(products: List[Dict], user_context: str) -> str:
         """Format product recommendation prompt"""
-        product_list = "\n".join([
-            f"- {p['name']}: ${p['price']} - {p['description']}"
-            for p in products
-        ])
+        buf = io.StringIO()
+        sep = ""
+        for p in products:
+            buf.write(f"{sep}- {p['name']}: ${p['price']} - {p['description']}")
+            sep = "\n"
+        product_list = buf.getvalue()
         
         return f"""
         User Context: {user_context}
@@ -263,10 +727,12 @@ class PromptTemplates:
     @staticmethod
     def format_accessibility_analysis(html_content: str, violations: List[Dict]) -> str:
         """Format accessibility analysis prompt"""
-        violation_list = "\n".join([
-            f"- {v['type']}: {v['description']} (Impact: {v['impact']})"
-            for v in violations
-        ])
+        buf = io.StringIO()
+        sep = ""
+        for v in violations:
+            buf.write(f"{sep}- {v['type']}: {v['description']} (Impact: {v['impact']})")
+            sep = "\n"
+        violation_list = buf.getvalue()
         
         return f"""
         HTML Content Analysis:
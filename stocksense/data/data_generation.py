@@ -5,12 +5,19 @@ Generates realistic sample inventory and sales data for demonstration purposes.
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 from datetime import datetime, timedelta
-import random
 
-# Set random seed for reproducibility
-np.random.seed(42)
-random.seed(42)
+# Seeded generator for reproducibility
+rng = np.random.default_rng(42)
+
+# Seasonal demand multipliers indexed by month - 1: post-holiday (Jan-Feb),
+# summer (Jun-Aug) and Black Friday/Christmas (Nov-Dec)
+MONTH_FACTOR = np.array([0.7, 0.7, 1.0, 1.0, 1.0, 1.2, 1.2, 1.2, 1.0, 1.0, 1.8, 1.8])
+
+# Weekend demand multipliers indexed by weekday (Monday = 0)
+WEEKEND_FACTOR = np.array([1.0, 1.0, 1.0, 1.0, 1.0, 1.3, 1.3])
 
 def generate_product_catalog(n_products=1000):
     """Generate a realistic product catalog"""
@@ -30,132 +37,130 @@ def generate_product_catalog(n_products=1000):
         'Automotive': ['Parts', 'Accessories', 'Tools', 'Care Products']
     }
     
-    products = []
-    for i in range(n_products):
-        category = random.choice(categories)
-        subcategory = random.choice(subcategories[category])
-        
-        # Generate realistic pricing based on category
-        price_ranges = {
-            'Electronics': (20, 2000),
-            'Clothing': (10, 200),
-            'Home & Garden': (15, 500),
-            'Food & Beverages': (1, 50),
-            'Health & Beauty': (5, 100),
-            'Sports & Outdoors': (20, 800),
-            'Toys & Games': (5, 150),
-            'Automotive': (10, 300)
-        }
-        
-        min_price, max_price = price_ranges[category]
-        price = round(np.random.uniform(min_price, max_price), 2)
-        
-        products.append({
-            'product_id': f'PROD{i+1:04d}',
-            'product_name': f'{subcategory} Item {i+1}',
-            'category': category,
-            'subcategory': subcategory,
-            'price': price,
-            'supplier_lead_time': random.choice([1, 2, 3, 5, 7, 10, 14]),  # days
-            'minimum_stock_level': random.randint(5, 100),
-            'seasonal_factor': round(np.random.uniform(0.5, 2.0), 2)
-        })
-    
-    return pd.DataFrame(products)
+    # Generate realistic pricing based on category
+    price_ranges = {
+        'Electronics': (20, 2000),
+        'Clothing': (10, 200),
+        'Home & Garden': (15, 500),
+        'Food & Beverages': (1, 50),
+        'Health & Beauty': (5, 100),
+        'Sports & Outdoors': (20, 800),
+        'Toys & Games': (5, 150),
+        'Automotive': (10, 300)
+    }
+    
+    category_arr = np.array(categories)
+    subcategory_arr = np.array([subcategories[c] for c in categories])
+    min_price = np.array([price_ranges[c][0] for c in categories])
+    max_price = np.array([price_ranges[c][1] for c in categories])
+    
+    # Draw every product attribute in one batch
+    cat_idx = rng.integers(0, len(categories), n_products)
+    sub_idx = rng.integers(0, subcategory_arr.shape[1], n_products)
+    category = category_arr[cat_idx]
+    subcategory = subcategory_arr[cat_idx, sub_idx]
+    prices = np.round(rng.uniform(min_price[cat_idx], max_price[cat_idx]), 2)
+    lead_times = rng.choice(np.array([1, 2, 3, 5, 7, 10, 14], dtype=np.int32), n_products)  # days
+    min_stock = rng.integers(5, 101, n_products, dtype=np.int32)
+    seasonal = np.round(rng.uniform(0.5, 2.0, n_products), 2)
+    
+    # Build id and name strings with vectorized numpy.char operations
+    item_numbers = np.arange(1, n_products + 1).astype(str)
+    
+    return pd.DataFrame({
+        'product_id': np.char.add('PROD', np.char.zfill(item_numbers, 4)),
+        'product_name': np.char.add(np.char.add(subcategory, ' Item '), item_numbers),
+        'category': pd.Categorical(category, categories=categories),
+        'subcategory': pd.Categorical(subcategory, categories=pd.unique(subcategory_arr.ravel())),
+        'price': prices,
+        'supplier_lead_time': lead_times,
+        'minimum_stock_level': min_stock,
+        'seasonal_factor': seasonal
+    })
 
 def generate_sales_data(products_df, n_days=365):
     """Generate historical sales data"""
     start_date = datetime.now() - timedelta(days=n_days)
-    sales_data = []
-    
-    for _, product in products_df.iterrows():
-        # Base daily demand based on category and price
-        category_demand = {
-            'Electronics': 50, 'Clothing': 80, 'Home & Garden': 30,
-            'Food & Beverages': 200, 'Health & Beauty': 60,
-            'Sports & Outdoors': 25, 'Toys & Games': 40, 'Automotive': 15
-        }
-        
-        base_demand = category_demand[product['category']]
-        price_factor = max(0.1, 100 / product['price'])  # Higher price = lower demand
-        
-        for day in range(n_days):
-            current_date = start_date + timedelta(days=day)
-            
-            # Seasonal effects
-            month = current_date.month
-            seasonal_multiplier = 1.0
-            
-            # Holiday seasons
-            if month in [11, 12]:  # Black Friday/Christmas
-                seasonal_multiplier = 1.8
-            elif month in [6, 7, 8]:  # Summer
-                seasonal_multiplier = 1.2
-            elif month in [1, 2]:  # Post-holiday
-                seasonal_multiplier = 0.7
-            
-            # Weekend effects
-            if current_date.weekday() >= 5:  # Weekend
-                seasonal_multiplier *= 1.3
-            
-            # Apply seasonal factor from product
-            seasonal_multiplier *= product['seasonal_factor']
-            
-            # Generate demand with noise
-            daily_demand = int(np.random.poisson(
-                max(1, base_demand * price_factor * seasonal_multiplier * 0.1)
-            ))
-            
-            # Occasional stockout simulation
-            stockout_prob = 0.02  # 2% chance of stockout
-            if np.random.random() < stockout_prob:
-                daily_demand = 0
-                stockout = 1
-            else:
-                stockout = 0
-            
-            sales_data.append({
-                'date': current_date,
-                'product_id': product['product_id'],
-                'daily_demand': daily_demand,
-                'stockout': stockout,
-                'day_of_week': current_date.weekday(),
-                'month': current_date.month,
-                'is_weekend': int(current_date.weekday() >= 5),
-                'is_holiday_season': int(month in [11, 12])
-            })
-    
-    return pd.DataFrame(sales_data)
+    n_products = len(products_df)
+    
+    # Base daily demand based on category and price
+    category_demand = {
+        'Electronics': 50, 'Clothing': 80, 'Home & Garden': 30,
+        'Food & Beverages': 200, 'Health & Beauty': 60,
+        'Sports & Outdoors': 25, 'Toys & Games': 40, 'Automotive': 15
+    }
+    
+    base_demand = products_df['category'].map(category_demand).to_numpy(dtype=float)
+    price_factor = np.maximum(0.1, 100 / products_df['price'].to_numpy(dtype=float))  # Higher price = lower demand
+    seasonal_product = products_df['seasonal_factor'].to_numpy(dtype=float)
+    
+    # Calendar features for every day in the window
+    first_day = np.datetime64(start_date, 'D')
+    dates = np.arange(first_day, first_day + n_days, dtype='datetime64[D]')
+    months = (dates.astype('datetime64[M]').astype(np.int64) % 12 + 1).astype(np.int8)
+    weekdays = ((dates.astype(np.int64) + 3) % 7).astype(np.int8)  # 1970-01-01 was a Thursday
+    is_weekend = weekdays >= 5
+    is_holiday = np.isin(months, [11, 12])
+    
+    # Seasonal and weekend effects
+    seasonal_time = MONTH_FACTOR[months - 1] * WEEKEND_FACTOR[weekdays]
+    
+    # Expected demand for every (product, day) pair
+    lam = (base_demand * price_factor * seasonal_product)[:, None] * seasonal_time[None, :] * 0.1
+    
+    # Generate demand with noise
+    daily_demand = rng.poisson(np.maximum(1, lam)).astype(np.int32)
+    
+    # Occasional stockout simulation (2% chance of stockout)
+    stockout = rng.random(lam.shape) < 0.02
+    daily_demand[stockout] = 0
+    
+    # Assemble column-wise with compact dtypes; flags are 0/1 int8 views of the masks
+    return pd.DataFrame({
+        'date': np.tile(dates, n_products),
+        'product_id': pd.Categorical.from_codes(
+            np.repeat(np.arange(n_products), n_days), categories=products_df['product_id']
+        ),
+        'daily_demand': daily_demand.ravel(),
+        'stockout': stockout.ravel().view(np.int8),
+        'day_of_week': np.tile(weekdays, n_products),
+        'month': np.tile(months, n_products),
+        'is_weekend': np.tile(is_weekend.view(np.int8), n_products),
+        'is_holiday_season': np.tile(is_holiday.view(np.int8), n_products)
+    })
 
 def generate_current_inventory(products_df):
     """Generate current inventory levels"""
-    inventory_data = []
-    
-    for _, product in products_df.iterrows():
-        # Current stock level (some products may be low)
-        if np.random.random() < 0.1:  # 10% chance of low stock
-            current_stock = random.randint(0, product['minimum_stock_level'])
-        else:
-            current_stock = random.randint(
-                product['minimum_stock_level'], 
-                product['minimum_stock_level'] * 5
-            )
-        
-        # Days since last restock
-        days_since_restock = random.randint(1, 30)
-        
-        inventory_data.append({
-            'product_id': product['product_id'],
-            'current_stock': current_stock,
-            'minimum_stock_level': product['minimum_stock_level'],
-            'days_since_restock': days_since_restock,
-            'supplier_lead_time': product['supplier_lead_time'],
-            'reorder_point': product['minimum_stock_level'] + 
-                           (product['supplier_lead_time'] * 2),  # Simple reorder point
-            'last_restock_date': datetime.now() - timedelta(days=days_since_restock)
-        })
-    
-    return pd.DataFrame(inventory_data)
+    n_products = len(products_df)
+    min_stock = products_df['minimum_stock_level'].to_numpy()
+    lead_times = products_df['supplier_lead_time'].to_numpy()
+    
+    # Current stock level (10% chance of low stock, otherwise 1-5x minimum)
+    low_stock = rng.random(n_products) < 0.1
+    current_stock = np.where(
+        low_stock,
+        rng.integers(0, min_stock + 1, dtype=np.int32),
+        rng.integers(min_stock, min_stock * 5 + 1, dtype=np.int32)
+    )
+    
+    # Days since last restock
+    days_since_restock = rng.integers(1, 31, n_products, dtype=np.int32)
+    
+    return pd.DataFrame({
+        'product_id': pd.Categorical.from_codes(
+            np.arange(n_products), categories=products_df['product_id']
+        ),
+        'current_stock': current_stock,
+        'minimum_stock_level': min_stock,
+        'days_since_restock': days_since_restock,
+        'supplier_lead_time': lead_times,
+        'reorder_point': min_stock + lead_times * 2,  # Simple reorder point
+        'last_restock_date': datetime.now() - pd.to_timedelta(days_since_restock, unit='D')
+    })
+
+def write_csv(df, path):
+    """Write a DataFrame to CSV using Arrow's multithreaded writer"""
+    pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
 
 def main():
     """Generate all sample data files"""
@@ -164,23 +169,24 @@ def main():
     # Generate product catalog
     print("Creating product catalog...")
     products_df = generate_product_catalog(1000)
-    products_df.to_csv('sample_products.csv', index=False)
+    write_csv(products_df, 'sample_products.csv')
     
     # Generate historical sales data
     print("Generating historical sales data...")
     sales_df = generate_sales_data(products_df, 365)
-    sales_df.to_csv('sample_sales_history.csv', index=False)
+    write_csv(sales_df, 'sample_sales_history.csv')
     
     # Generate current inventory
     print("Creating current inventory snapshot...")
     inventory_df = generate_current_inventory(products_df)
-    inventory_df.to_csv('sample_inventory.csv', index=False)
+    write_csv(inventory_df, 'sample_inventory.csv')
     
     # Create a summary dataset for ML training
     print("Creating ML training dataset...")
     
     # Aggregate sales data by product
-    sales_agg = sales_df.groupby('product_id').agg({
+    # product_id is categorical, so grouping runs on its integer codes
+    sales_agg = sales_df.groupby('product_id', observed=True, sort=False).agg({
         'daily_demand': ['mean', 'std', 'max'],
         'stockout': 'sum',
         'is_weekend': 'mean',
@@ -193,19 +199,28 @@ def main():
         'total_stockouts', 'weekend_sales_ratio', 'holiday_sales_ratio'
     ]
     
-    # Merge with product and inventory data
-    ml_dataset = products_df.merge(sales_agg, on='product_id')
-    ml_dataset = ml_dataset.merge(inventory_df, on='product_id')
-    
-    # Calculate risk indicators
-    ml_dataset['demand_variability'] = ml_dataset['demand_std'] / ml_dataset['avg_daily_demand']
-    ml_dataset['stock_coverage_days'] = ml_dataset['current_stock'] / ml_dataset['avg_daily_demand']
-    ml_dataset['is_high_risk'] = (
-        (ml_dataset['stock_coverage_days'] <= ml_dataset['supplier_lead_time']) |
-        (ml_dataset['current_stock'] <= ml_dataset['minimum_stock_level'])
-    ).astype(int)
-    
-    ml_dataset.to_csv('ml_training_data.csv', index=False)
+    # Join with product and inventory data on product_id. Inventory repeats the
+    # catalog's lead time and minimum stock columns, so only its own columns are joined.
+    inventory_by_id = inventory_df.set_index('product_id')
+    inventory_cols = inventory_by_id.columns.difference(products_df.columns, sort=False)
+    ml_dataset = products_df.set_index('product_id', drop=False).join(
+        [sales_agg.set_index('product_id'), inventory_by_id[inventory_cols]],
+        how='inner'
+    )
+    
+    # Calculate risk indicators (eval hands the arithmetic to numexpr, avoiding temporary Series)
+    ml_dataset.eval(
+        """
+        demand_variability = demand_std / avg_daily_demand
+        stock_coverage_days = current_stock / avg_daily_demand
+        """,
+        inplace=True
+    )
+    ml_dataset['is_high_risk'] = ml_dataset.eval(
+        "(stock_coverage_days <= supplier_lead_time) | (current_stock <= minimum_stock_level)"
+    ).astype(np.int8)
+    
+    write_csv(ml_dataset, 'ml_training_data.csv')
     
     print("\n✅ Sample data generation completed!")
     print(f"📊 Generated data for {len(products_df)} products")
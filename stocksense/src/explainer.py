@@ -5,20 +5,296 @@ Provides explanations and insights for stockout predictions
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import joblib
 import logging
-from typing import Dict, List, Any
+from operator import itemgetter
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, NamedTuple, TYPE_CHECKING
+from dataclasses import dataclass, fields
 from datetime import datetime
 
+# plotly is only needed by the chart methods and is imported there
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Columns of the factor-code matrix produced by _score_factors
+FACTOR_COVERAGE = 0        # 0 = good, 1 = warning (< 2x lead time), 2 = critical (< lead time)
+FACTOR_BELOW_MINIMUM = 1   # 1 if current stock is below the minimum stock level
+FACTOR_VARIABILITY = 2     # 1 if demand variability is above 50%
+FACTOR_LEAD_TIME = 3       # 1 if supplier lead time is above 14 days
+
+# Core product fields read by the explanation helpers, and their defaults
+PRODUCT_DEFAULTS = {
+    'current_stock': 0,
+    'avg_daily_demand': 1,
+    'supplier_lead_time': 7,
+    'minimum_stock_level': 10,
+}
+_PRODUCT_FIELDS = itemgetter(*PRODUCT_DEFAULTS)
+
+def _product_fields(product_data: Dict) -> tuple:
+    """
+    Read (current_stock, avg_daily_demand, supplier_lead_time, minimum_stock_level)
+    in one lookup, filling in PRODUCT_DEFAULTS only when a field is missing
+    """
+    try:
+        return _PRODUCT_FIELDS(product_data)
+    except KeyError:
+        return _PRODUCT_FIELDS({**PRODUCT_DEFAULTS, **product_data})
+
+class DerivedMetrics(NamedTuple):
+    """Per-product values shared by the narrative and suggestion helpers"""
+    current_stock: float
+    daily_demand: float
+    lead_time: float
+    min_stock: float
+    demand_std: float
+    stock_days: float
+    safety_stock: float
+
+def _derive(product_data: Dict) -> DerivedMetrics:
+    """
+    Compute the derived metrics for one product once
+    
+    Args:
+        product_data (dict): Product information
+        
+    Returns:
+        DerivedMetrics: Product fields plus stock coverage and safety stock
+    """
+    current_stock, daily_demand, lead_time, min_stock = _product_fields(product_data)
+    
+    return DerivedMetrics(
+        current_stock=current_stock,
+        daily_demand=daily_demand,
+        lead_time=lead_time,
+        min_stock=min_stock,
+        demand_std=product_data.get('demand_std', daily_demand * 0.2),
+        stock_days=current_stock / max(daily_demand, 1),
+        safety_stock=daily_demand * lead_time * 1.5
+    )
+
+# Narrative templates for _generate_narrative, by risk level
+NARRATIVE_HIGH = (
+    "🚨 HIGH RISK: This product has a {risk:.0%} chance of stockout. "
+    "With only {stock} units in stock and daily demand of {demand:.1f}, "
+    "the current inventory will last approximately {days:.1f} days. "
+    "Given the supplier lead time of {lead} days, immediate action is required."
+)
+NARRATIVE_MEDIUM = (
+    "⚠️ MEDIUM RISK: This product has a {risk:.0%} chance of stockout. "
+    "Current stock of {stock} units provides {days:.1f} days of coverage. "
+    "Consider reordering soon to maintain adequate inventory levels."
+)
+NARRATIVE_LOW = (
+    "✅ LOW RISK: This product has a {risk:.0%} chance of stockout. "
+    "Current stock levels appear adequate with {days:.1f} days of coverage. "
+    "Continue monitoring for any changes in demand patterns."
+)
+# Risk scores above each threshold move up one template (low -> medium -> high)
+NARRATIVE_THRESHOLDS = [0.4, 0.7]
+NARRATIVE_TEMPLATES = (NARRATIVE_LOW, NARRATIVE_MEDIUM, NARRATIVE_HIGH)
+
+def _score_factors(current_stock: np.ndarray, daily_demand: np.ndarray, lead_time: np.ndarray,
+                   min_stock: np.ndarray, demand_std: np.ndarray) -> tuple:
+    """
+    Score risk factors for many products in one vectorized pass
+    
+    Args:
+        current_stock (ndarray): Units in stock per product
+        daily_demand (ndarray): Average daily demand per product
+        lead_time (ndarray): Supplier lead time in days per product
+        min_stock (ndarray): Minimum stock level per product
+        demand_std (ndarray): Daily demand standard deviation per product
+        
+    Returns:
+        tuple: (codes, stock_days, variability) where codes is an (N, 4) int8 matrix
+            indexed by the FACTOR_* constants
+    """
+    demand_floor = np.maximum(daily_demand, 1)
+    stock_days = current_stock / demand_floor
+    variability = demand_std / demand_floor
+    
+    codes = np.empty((len(stock_days), 4), dtype=np.int8)
+    codes[:, FACTOR_COVERAGE] = np.where(stock_days < lead_time, 2, np.where(stock_days < lead_time * 2, 1, 0))
+    codes[:, FACTOR_BELOW_MINIMUM] = current_stock < min_stock
+    codes[:, FACTOR_VARIABILITY] = variability > 0.5
+    codes[:, FACTOR_LEAD_TIME] = lead_time > 14
+    
+    return codes, stock_days, variability
+
+@dataclass
+class ProductBatch:
+    """
+    Columnar (structure-of-arrays) view of product data
+    
+    Missing values are replaced by the same defaults the single-product methods
+    use, once, when the batch is built.
+    """
+    current_stock: np.ndarray
+    avg_daily_demand: np.ndarray
+    supplier_lead_time: np.ndarray
+    minimum_stock_level: np.ndarray
+    demand_std: np.ndarray
+    total_stockouts: np.ndarray
+    
+    DEFAULTS = {
+        **PRODUCT_DEFAULTS,
+        'demand_std': np.nan,  # Filled in as 20% of daily demand
+        'total_stockouts': 0,
+    }
+    
+    def __len__(self) -> int:
+        return len(self.current_stock)
+    
+    @classmethod
+    def _from_columns(cls, columns: Dict[str, np.ndarray]) -> 'ProductBatch':
+        for name, default in cls.DEFAULTS.items():
+            column = columns[name]
+            columns[name] = np.where(np.isnan(column), default, column)
+        
+        columns['demand_std'] = np.where(np.isnan(columns['demand_std']),
+                                         columns['avg_daily_demand'] * 0.2, columns['demand_std'])
+        return cls(**columns)
+    
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> 'ProductBatch':
+        """
+        Build a batch from a list of product dictionaries
+        
+        Args:
+            records (list): Product dictionaries
+            
+        Returns:
+            ProductBatch: Columnar product data
+        """
+        return cls._from_columns({
+            field.name: np.array([record.get(field.name, np.nan) for record in records], dtype=np.float64)
+            for field in fields(cls)
+        })
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'ProductBatch':
+        """
+        Build a batch from a product DataFrame
+        
+        Args:
+            df (DataFrame): Product data, one row per product
+            
+        Returns:
+            ProductBatch: Columnar product data
+        """
+        return cls._from_columns({
+            field.name: (df[field.name].to_numpy(dtype=np.float64) if field.name in df.columns
+                         else np.full(len(df), np.nan))
+            for field in fields(cls)
+        })
+    
+    def score_factors(self) -> tuple:
+        """
+        Score risk factors for every product in the batch (see _score_factors)
+        """
+        return _score_factors(self.current_stock, self.avg_daily_demand, self.supplier_lead_time,
+                              self.minimum_stock_level, self.demand_std)
+    
+    def radar_factors(self) -> np.ndarray:
+        """
+        Normalized radar-chart risk factors (0-1 scale, higher = more risk)
+        
+        Returns:
+            ndarray: (N, 5) matrix with columns in RADAR_FACTORS order
+        """
+        daily_demand = np.maximum(self.avg_daily_demand, 1)
+        min_stock = self.minimum_stock_level
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            raw = np.column_stack([
+                1 - (self.current_stock / daily_demand) / (self.supplier_lead_time * 2),
+                self.supplier_lead_time / 21,  # 21 days = max risk
+                np.where(min_stock > 0, 1 - self.current_stock / min_stock, 0),
+                self.demand_std / daily_demand,
+                self.total_stockouts / 10,  # 10+ = max risk
+            ])
+        
+        return np.clip(raw, 0, 1)
+
+def _summary_kernel(scores: np.ndarray, stock: Optional[np.ndarray] = None,
+                    price: Optional[np.ndarray] = None) -> tuple:
+    """
+    Aggregate risk buckets, average score and high-risk stock value in one bucketing pass
+    
+    Missing (NaN) scores are left out of every aggregate, as pandas comparisons
+    and mean() leave them out.
+    
+    Args:
+        scores (ndarray): Risk scores
+        stock (ndarray, optional): Current stock per product
+        price (ndarray, optional): Unit price per product
+        
+    Returns:
+        tuple: (counts, avg_risk, lost_sales_high) where counts holds the number of
+            low (< 0.3), medium and high (>= 0.7) risk products
+    """
+    scored = np.isfinite(scores)
+    
+    # 0 = low, 1 = medium, 2 = high
+    buckets = np.digitize(scores[scored], [0.3, 0.7])
+    counts = np.bincount(buckets, minlength=3)
+    avg_risk = np.nanmean(scores[scored]) if counts.sum() else np.nan
+    
+    lost_sales_high = 0.0
+    if stock is not None and price is not None:
+        high_risk = scored.copy()
+        high_risk[scored] = buckets == 2
+        lost_sales_high = np.nansum(stock[high_risk].astype(np.float64) * price[high_risk].astype(np.float64))
+    
+    return counts, avg_risk, lost_sales_high
+
+@lru_cache(maxsize=None)
+def _static_suggestions(high_risk: bool, long_lead_time: bool, volatile_demand: bool) -> tuple:
+    """
+    Fixed-text improvement suggestions for a combination of risk flags
+    
+    Only a handful of combinations exist, so each pair of tuples is built once
+    and shared by every product that maps to it.
+    
+    Returns:
+        tuple: (leading, trailing) suggestions that go before and after the
+            product-specific reorder suggestions
+    """
+    leading = []
+    trailing = []
+    
+    # Immediate actions
+    if high_risk:
+        leading.append("📞 Contact supplier immediately for emergency delivery")
+        leading.append("🔍 Review alternative suppliers for faster delivery")
+        leading.append("📊 Implement daily stock monitoring for this product")
+    
+    # Process improvements
+    if long_lead_time:
+        trailing.append("🤝 Negotiate shorter lead times with supplier")
+        trailing.append("🏪 Consider local suppliers to reduce lead time")
+    
+    if volatile_demand:
+        trailing.append("📈 Implement demand forecasting to better predict variations")
+        trailing.append("📊 Analyze demand patterns to identify trends")
+    
+    # Technology improvements
+    trailing.append("🤖 Set up automated reorder alerts")
+    trailing.append("📱 Implement real-time inventory tracking")
+    
+    return tuple(leading), tuple(trailing)
+
+# Radar chart axes, in ProductBatch.radar_factors column order
+RADAR_FACTORS = ['Stock Coverage Risk', 'Lead Time Risk', 'Minimum Stock Risk',
+                 'Demand Variability', 'Historical Stockouts']
+
 class StockSenseExplainer:
     """
     Explainer class for StockSense predictions
@@ -35,23 +311,35 @@ class StockSenseExplainer:
         self.model_path = model_path
         self.model_data = None
         self.feature_importance = None
+        self._fi_names = None   # Feature names, sorted by importance (descending)
+        self._fi_values = None  # Matching importance scores
         self.load_model()
         
     def load_model(self):
         """Load the trained model and extract feature importance"""
         try:
-            self.model_data = joblib.load(self.model_path)
+            # Memory-map the model's arrays so explainer processes can share their pages
+            self.model_data = joblib.load(self.model_path, mmap_mode='r')
             
-            # Extract feature importance if available
             model = self.model_data['model']
+            
+            # A booster saved with predictor='gpu_predictor' still explains on a CPU-only host
+            if self.model_data.get('device') == 'cuda':
+                from model import get_xgb_device  # Only GPU-trained (XGBoost) models need it
+                if get_xgb_device() != 'cuda':
+                    model.set_params(predictor='cpu_predictor')
+            
+            # Extract feature importance if available
             if hasattr(model, 'feature_importances_'):
-                feature_names = self.model_data['feature_names']
-                importances = model.feature_importances_
+                importances = np.array(model.feature_importances_)  # Small writable copy
+                order = np.argsort(-importances, kind='stable')
                 
+                self._fi_names = np.asarray(self.model_data['feature_names'])[order]
+                self._fi_values = importances[order]
                 self.feature_importance = pd.DataFrame({
-                    'feature': feature_names,
-                    'importance': importances
-                }).sort_values('importance', ascending=False)
+                    'feature': self._fi_names,
+                    'importance': self._fi_values
+                })
                 
             logger.info(f"Model and explainer loaded successfully from {self.model_path}")
             
@@ -62,6 +350,38 @@ class StockSenseExplainer:
             logger.error(f"Error loading model: {e}")
             raise
     
+    def shap_values(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        Per-prediction feature attributions (TreeSHAP) for the loaded model
+        
+        XGBoost models use the booster's built-in TreeSHAP (pred_contribs), which runs
+        on the GPU when the booster is configured for one. Other tree ensembles go
+        through shap.TreeExplainer, imported on first use.
+        
+        Args:
+            X (DataFrame): Model-ready features (as produced by StockSenseModel.prepare_features)
+            
+        Returns:
+            ndarray: (n_samples, n_features) attributions towards the high-risk class
+        """
+        model = self.model_data['model']
+        
+        if hasattr(model, 'get_booster'):
+            import xgboost as xgb
+            contributions = model.get_booster().predict(xgb.DMatrix(X), pred_contribs=True)
+            return contributions[:, :-1]  # Last column is the bias term
+        
+        import shap  # Only needed for non-XGBoost models
+        values = shap.TreeExplainer(model, feature_perturbation='tree_path_dependent').shap_values(X)
+        
+        # sklearn classifiers return attributions for each class
+        if isinstance(values, list):
+            values = values[1]
+        elif np.ndim(values) == 3:
+            values = values[..., 1]
+        
+        return values
+    
     def explain_prediction(self, product_data: Dict, prediction_result: Dict) -> Dict:
         """
         Provide detailed explanation for a single product's prediction
@@ -73,6 +393,62 @@ class StockSenseExplainer:
         Returns:
             dict: Detailed explanation
         """
+        return self._build_explanation(product_data, prediction_result,
+                                       self._identify_key_factors(product_data))
+    
+    def explain_batch(self, predictions_df: pd.DataFrame, top_n: Optional[int] = None) -> List[Dict]:
+        """
+        Explain predictions for many products at once
+        
+        Risk factors are scored for every product in one vectorized pass; explanation
+        text is only rendered for the products that are returned.
+        
+        Args:
+            predictions_df (DataFrame): Product data with prediction columns (e.g. predict_batch output)
+            top_n (int, optional): Only explain the top_n highest-risk products
+            
+        Returns:
+            list: Explanations in explain_prediction format, highest risk first
+        """
+        if 'risk_score' not in predictions_df.columns:
+            logger.warning("Risk scores not found in predictions")
+            return []
+        
+        codes, stock_days, variability = ProductBatch.from_frame(predictions_df).score_factors()
+        
+        scores = predictions_df['risk_score'].to_numpy()
+        # searchsorted sorts NaN past every threshold; bisect_left (the scalar path) gives it
+        # the low-risk template, so batch explanations do the same
+        narrative_levels = np.where(np.isnan(scores), 0, np.searchsorted(NARRATIVE_THRESHOLDS, scores))
+        
+        # Only the rows being returned are turned into text
+        order = np.argsort(-scores, kind='stable')[:top_n]
+        records = predictions_df.iloc[order].to_dict('records')
+        
+        explanations = []
+        for i, product_data in zip(order, records):
+            key_factors = self._render_key_factors(codes[i], stock_days[i], variability[i], product_data)
+            explanations.append(self._build_explanation(product_data, product_data, key_factors,
+                                                        narrative_levels[i]))
+        
+        return explanations
+    
+    def _build_explanation(self, product_data: Dict, prediction_result: Dict,
+                           key_factors: List[Dict], narrative_level: Optional[int] = None) -> Dict:
+        """
+        Assemble the explanation dictionary for one product
+        
+        Args:
+            product_data (dict): Original product data
+            prediction_result (dict): Prediction results
+            key_factors (list): Key risk factors for the product
+            narrative_level (int, optional): Precomputed NARRATIVE_TEMPLATES index
+            
+        Returns:
+            dict: Detailed explanation
+        """
+        derived = _derive(product_data)
+        
         explanation = {
             'product_info': {
                 'product_id': product_data.get('product_id', 'Unknown'),
@@ -85,9 +461,10 @@ class StockSenseExplainer:
                 'risk_level': prediction_result.get('risk_level', 'Unknown'),
                 'risk_category': prediction_result.get('risk_category', 'Unknown')
             },
-            'key_factors': self._identify_key_factors(product_data),
-            'explanation_narrative': self._generate_narrative(product_data, prediction_result),
-            'improvement_suggestions': self._suggest_improvements(product_data, prediction_result)
+            'key_factors': key_factors,
+            'explanation_narrative': self._generate_narrative(product_data, prediction_result,
+                                                              narrative_level, derived),
+            'improvement_suggestions': self._suggest_improvements(product_data, prediction_result, derived)
         }
         
         return explanation
@@ -102,18 +479,30 @@ class StockSenseExplainer:
         Returns:
             list: Key risk factors with explanations
         """
-        factors = []
+        codes, stock_days, variability = ProductBatch.from_records([product_data]).score_factors()
         
-        current_stock = product_data.get('current_stock', 0)
-        daily_demand = product_data.get('avg_daily_demand', 1)
-        lead_time = product_data.get('supplier_lead_time', 7)
-        min_stock = product_data.get('minimum_stock_level', 10)
+        return self._render_key_factors(codes[0], stock_days[0], variability[0], product_data)
+    
+    def _render_key_factors(self, codes: np.ndarray, stock_days: float, variability: float,
+                            product_data: Dict) -> List[Dict]:
+        """
+        Turn one product's factor codes into readable risk factors
+        
+        Args:
+            codes (ndarray): Factor codes for the product (see _score_factors)
+            stock_days (float): Days of demand covered by current stock
+            variability (float): Demand standard deviation relative to demand
+            product_data (dict): Product information, used for display values
+            
+        Returns:
+            list: Key risk factors with explanations
+        """
+        factors = []
         
-        # Calculate key metrics
-        stock_days = current_stock / max(daily_demand, 1)
+        current_stock, _, lead_time, min_stock = _product_fields(product_data)
         
         # Stock coverage factor
-        if stock_days < lead_time:
+        if codes[FACTOR_COVERAGE] == 2:
             factors.append({
                 'factor': 'Stock Coverage',
                 'value': f"{stock_days:.1f} days",
@@ -121,7 +510,7 @@ class StockSenseExplainer:
                 'impact': 'High',
                 'explanation': f"Current stock will last {stock_days:.1f} days, but supplier lead time is {lead_time} days"
             })
-        elif stock_days < lead_time * 2:
+        elif codes[FACTOR_COVERAGE] == 1:
             factors.append({
                 'factor': 'Stock Coverage',
                 'value': f"{stock_days:.1f} days", 
@@ -139,7 +528,7 @@ class StockSenseExplainer:
             })
         
         # Minimum stock level factor
-        if current_stock < min_stock:
+        if codes[FACTOR_BELOW_MINIMUM]:
             factors.append({
                 'factor': 'Minimum Stock Level',
                 'value': f"{current_stock}/{min_stock}",
@@ -149,10 +538,7 @@ class StockSenseExplainer:
             })
         
         # Demand variability factor
-        demand_std = product_data.get('demand_std', daily_demand * 0.2)
-        variability = demand_std / max(daily_demand, 1)
-        
-        if variability > 0.5:
+        if codes[FACTOR_VARIABILITY]:
             factors.append({
                 'factor': 'Demand Variability',
                 'value': f"{variability:.1%}",
@@ -162,7 +548,7 @@ class StockSenseExplainer:
             })
         
         # Lead time factor
-        if lead_time > 14:
+        if codes[FACTOR_LEAD_TIME]:
             factors.append({
                 'factor': 'Supplier Lead Time',
                 'value': f"{lead_time} days",
@@ -173,68 +559,61 @@ class StockSenseExplainer:
         
         return factors
     
-    def _generate_narrative(self, product_data: Dict, prediction_result: Dict) -> str:
+    def _generate_narrative(self, product_data: Dict, prediction_result: Dict,
+                            level: Optional[int] = None,
+                            derived: Optional[DerivedMetrics] = None) -> str:
         """
         Generate human-readable explanation narrative
         
         Args:
             product_data (dict): Product information
             prediction_result (dict): Prediction results
+            level (int, optional): Precomputed NARRATIVE_TEMPLATES index
+            derived (DerivedMetrics, optional): Precomputed metrics for the product
             
         Returns:
             str: Narrative explanation
         """
         risk_score = prediction_result.get('risk_score', 0)
-        current_stock = product_data.get('current_stock', 0)
-        daily_demand = product_data.get('avg_daily_demand', 1)
-        lead_time = product_data.get('supplier_lead_time', 7)
-        
-        stock_days = current_stock / max(daily_demand, 1)
-        
-        if risk_score > 0.7:
-            narrative = f"🚨 HIGH RISK: This product has a {risk_score:.0%} chance of stockout. "
-            narrative += f"With only {current_stock} units in stock and daily demand of {daily_demand:.1f}, "
-            narrative += f"the current inventory will last approximately {stock_days:.1f} days. "
-            narrative += f"Given the supplier lead time of {lead_time} days, immediate action is required."
-            
-        elif risk_score > 0.4:
-            narrative = f"⚠️ MEDIUM RISK: This product has a {risk_score:.0%} chance of stockout. "
-            narrative += f"Current stock of {current_stock} units provides {stock_days:.1f} days of coverage. "
-            narrative += f"Consider reordering soon to maintain adequate inventory levels."
-            
-        else:
-            narrative = f"✅ LOW RISK: This product has a {risk_score:.0%} chance of stockout. "
-            narrative += f"Current stock levels appear adequate with {stock_days:.1f} days of coverage. "
-            narrative += "Continue monitoring for any changes in demand patterns."
-        
-        return narrative
+        if derived is None:
+            derived = _derive(product_data)
+        
+        if level is None:
+            level = bisect_left(NARRATIVE_THRESHOLDS, risk_score)
+        
+        return NARRATIVE_TEMPLATES[level].format_map({
+            'risk': risk_score,
+            'stock': derived.current_stock,
+            'demand': derived.daily_demand,
+            'days': derived.stock_days,
+            'lead': derived.lead_time
+        })
     
-    def _suggest_improvements(self, product_data: Dict, prediction_result: Dict) -> List[str]:
+    def _suggest_improvements(self, product_data: Dict, prediction_result: Dict,
+                              derived: Optional[DerivedMetrics] = None) -> List[str]:
         """
         Suggest specific improvements to reduce stockout risk
         
         Args:
             product_data (dict): Product information
             prediction_result (dict): Prediction results
+            derived (DerivedMetrics, optional): Precomputed metrics for the product
             
         Returns:
             list: Improvement suggestions
         """
-        suggestions = []
+        if derived is None:
+            derived = _derive(product_data)
         
-        current_stock = product_data.get('current_stock', 0)
-        daily_demand = product_data.get('avg_daily_demand', 1)
-        lead_time = product_data.get('supplier_lead_time', 7)
-        min_stock = product_data.get('minimum_stock_level', 10)
+        current_stock, daily_demand, lead_time, _, demand_std, stock_days, safety_stock = derived
         
-        stock_days = current_stock / max(daily_demand, 1)
-        safety_stock = daily_demand * lead_time * 1.5
+        leading, trailing = _static_suggestions(
+            prediction_result.get('risk_score', 0) > 0.7,
+            lead_time > 10,
+            demand_std / daily_demand > 0.4
+        )
         
-        # Immediate actions
-        if prediction_result.get('risk_score', 0) > 0.7:
-            suggestions.append("📞 Contact supplier immediately for emergency delivery")
-            suggestions.append("🔍 Review alternative suppliers for faster delivery")
-            suggestions.append("📊 Implement daily stock monitoring for this product")
+        suggestions = list(leading)
         
         # Inventory management improvements
         if current_stock < safety_stock:
@@ -245,23 +624,11 @@ class StockSenseExplainer:
             new_reorder_point = int(daily_demand * lead_time * 2)
             suggestions.append(f"🎯 Set reorder point to {new_reorder_point} units (2x lead time demand)")
         
-        # Process improvements
-        if lead_time > 10:
-            suggestions.append("🤝 Negotiate shorter lead times with supplier")
-            suggestions.append("🏪 Consider local suppliers to reduce lead time")
-        
-        demand_std = product_data.get('demand_std', daily_demand * 0.2)
-        if demand_std / daily_demand > 0.4:
-            suggestions.append("📈 Implement demand forecasting to better predict variations")
-            suggestions.append("📊 Analyze demand patterns to identify trends")
-        
-        # Technology improvements
-        suggestions.append("🤖 Set up automated reorder alerts")
-        suggestions.append("📱 Implement real-time inventory tracking")
+        suggestions.extend(trailing)
         
         return suggestions
     
-    def create_feature_importance_plot(self, top_n: int = 15) -> go.Figure:
+    def create_feature_importance_plot(self, top_n: int = 15) -> 'go.Figure':
         """
         Create interactive feature importance plot
         
@@ -271,32 +638,33 @@ class StockSenseExplainer:
         Returns:
             plotly Figure: Interactive feature importance plot
         """
-        if self.feature_importance is None:
+        import plotly.graph_objects as go
+        
+        if self._fi_values is None:
             logger.warning("Feature importance not available")
             return go.Figure()
         
-        top_features = self.feature_importance.head(top_n)
+        names = self._fi_names[:top_n]
+        values = self._fi_values[:top_n]
         
-        fig = px.bar(
-            top_features,
-            x='importance',
-            y='feature',
+        fig = go.Figure(go.Bar(
+            x=values,
+            y=names,
             orientation='h',
-            title=f'Top {top_n} Feature Importances',
-            labels={'importance': 'Importance Score', 'feature': 'Feature'},
-            color='importance',
-            color_continuous_scale='Reds'
-        )
+            marker=dict(color=values, colorscale='Reds', colorbar=dict(title='Importance Score'))
+        ))
         
         fig.update_layout(
+            title=f'Top {top_n} Feature Importances',
             height=600,
-            yaxis={'categoryorder': 'total ascending'},
+            xaxis={'title': 'Importance Score'},
+            yaxis={'title': 'Feature', 'categoryorder': 'total ascending'},
             showlegend=False
         )
         
         return fig
     
-    def create_risk_distribution_plot(self, predictions_df: pd.DataFrame) -> go.Figure:
+    def create_risk_distribution_plot(self, predictions_df: pd.DataFrame) -> 'go.Figure':
         """
         Create risk distribution visualization
         
@@ -306,17 +674,28 @@ class StockSenseExplainer:
         Returns:
             plotly Figure: Risk distribution plot
         """
+        import plotly.graph_objects as go
+        
         if 'risk_score' not in predictions_df.columns:
             logger.warning("Risk scores not found in predictions")
             return go.Figure()
         
-        fig = px.histogram(
-            predictions_df,
-            x='risk_score',
-            nbins=20,
+        # Bin on the server so the figure carries 20 counts instead of every score
+        counts, edges = np.histogram(predictions_df['risk_score'].to_numpy(), bins=20, range=(0.0, 1.0))
+        centers = 0.5 * (edges[:-1] + edges[1:])
+        
+        fig = go.Figure(go.Bar(
+            x=centers,
+            y=counts,
+            width=edges[1] - edges[0],
+            marker_color='skyblue'
+        ))
+        
+        fig.update_layout(
             title='Risk Score Distribution',
-            labels={'risk_score': 'Risk Score', 'count': 'Number of Products'},
-            color_discrete_sequence=['skyblue']
+            xaxis_title='Risk Score',
+            yaxis_title='Number of Products',
+            bargap=0
         )
         
         # Add risk threshold lines
@@ -329,7 +708,7 @@ class StockSenseExplainer:
         
         return fig
     
-    def create_risk_factors_radar(self, product_data: Dict) -> go.Figure:
+    def create_risk_factors_radar(self, product_data: Dict) -> 'go.Figure':
         """
         Create radar chart showing risk factors for a single product
         
@@ -339,29 +718,39 @@ class StockSenseExplainer:
         Returns:
             plotly Figure: Radar chart
         """
-        # Calculate normalized risk factors (0-1 scale)
-        current_stock = product_data.get('current_stock', 0)
-        daily_demand = max(product_data.get('avg_daily_demand', 1), 1)
-        lead_time = product_data.get('supplier_lead_time', 7)
-        min_stock = product_data.get('minimum_stock_level', 10)
-        
-        # Normalize factors (higher = more risk)
-        factors = {
-            'Stock Coverage Risk': max(0, min(1, 1 - (current_stock / daily_demand) / (lead_time * 2))),
-            'Lead Time Risk': min(1, lead_time / 21),  # 21 days = max risk
-            'Minimum Stock Risk': max(0, min(1, 1 - current_stock / min_stock)) if min_stock > 0 else 0,
-            'Demand Variability': min(1, product_data.get('demand_std', daily_demand * 0.2) / daily_demand),
-            'Historical Stockouts': min(1, product_data.get('total_stockouts', 0) / 10),  # 10+ = max risk
-        }
+        values = ProductBatch.from_records([product_data]).radar_factors()[0]
         
-        categories = list(factors.keys())
-        values = list(factors.values())
+        return self._radar_figure(values)
+    
+    def create_risk_factors_radar_batch(self, batch: ProductBatch) -> List['go.Figure']:
+        """
+        Create radar charts for every product in a batch
+        
+        Args:
+            batch (ProductBatch): Product information
+            
+        Returns:
+            list: One radar chart per product
+        """
+        return [self._radar_figure(values) for values in batch.radar_factors()]
+    
+    def _radar_figure(self, values: np.ndarray) -> 'go.Figure':
+        """
+        Build the radar chart for one product's normalized risk factors
+        
+        Args:
+            values (ndarray): Risk factors in RADAR_FACTORS order
+            
+        Returns:
+            plotly Figure: Radar chart
+        """
+        import plotly.graph_objects as go
         
         fig = go.Figure()
         
         fig.add_trace(go.Scatterpolar(
             r=values,
-            theta=categories,
+            theta=RADAR_FACTORS,
             fill='toself',
             name='Risk Factors',
             line_color='red',
@@ -384,8 +773,11 @@ class StockSenseExplainer:
         """
         Generate executive summary of inventory risk
         
+        Columns are only read through to_numpy(), so a polars DataFrame works
+        here as well as a pandas one, without converting it first.
+        
         Args:
-            predictions_df (DataFrame): Prediction results
+            predictions_df (DataFrame): Prediction results (pandas or polars)
             
         Returns:
             dict: Executive summary data
@@ -395,25 +787,31 @@ class StockSenseExplainer:
         if 'risk_score' not in predictions_df.columns:
             return {'error': 'Risk scores not available'}
         
-        high_risk = (predictions_df['risk_score'] >= 0.7).sum()
-        medium_risk = ((predictions_df['risk_score'] >= 0.3) & 
-                      (predictions_df['risk_score'] < 0.7)).sum()
-        low_risk = (predictions_df['risk_score'] < 0.3).sum()
+        scores = predictions_df['risk_score'].to_numpy()
         
-        avg_risk = predictions_df['risk_score'].mean()
+        has_financials = 'current_stock' in predictions_df.columns and 'price' in predictions_df.columns
+        (low_risk, medium_risk, high_risk), avg_risk, lost_sales = _summary_kernel(
+            scores,
+            predictions_df['current_stock'].to_numpy() if has_financials else None,
+            predictions_df['price'].to_numpy() if has_financials else None
+        )
         
         # Calculate potential impact
-        if 'current_stock' in predictions_df.columns and 'price' in predictions_df.columns:
-            high_risk_products = predictions_df[predictions_df['risk_score'] >= 0.7]
-            potential_lost_sales = (high_risk_products['current_stock'] * 
-                                  high_risk_products.get('price', 50)).sum()
-        else:
-            potential_lost_sales = None
+        potential_lost_sales = lost_sales if has_financials else None
         
-        # Top risk categories
+        # Top 5 risk categories by mean risk score, aggregated over integer category codes
         category_risk = None
         if 'category' in predictions_df.columns:
-            category_risk = predictions_df.groupby('category')['risk_score'].mean().sort_values(ascending=False)
+            codes, categories = pd.factorize(predictions_df['category'].to_numpy())
+            # Missing categories and scores are skipped, as in groupby().mean()
+            valid = (codes >= 0) & np.isfinite(scores)
+            with np.errstate(invalid='ignore'):  # NaN mean for a category with no scores
+                means = np.bincount(codes[valid], weights=scores[valid]) / np.bincount(codes[valid])
+            
+            top_n = min(5, len(means))
+            top = np.argpartition(-means, top_n - 1)[:top_n] if top_n else np.array([], dtype=int)
+            top = top[np.argsort(-means[top])]
+            category_risk = {categories[i]: float(means[i]) for i in top}
         
         summary = {
             'timestamp': datetime.now().isoformat(),
@@ -448,7 +846,7 @@ class StockSenseExplainer:
             )
         
         if category_risk is not None:
-            summary['category_analysis'] = category_risk.head(5).to_dict()
+            summary['category_analysis'] = category_risk
         
         return summary
 
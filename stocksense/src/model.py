@@ -8,10 +8,12 @@ import numpy as np
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.linear_model import LogisticRegression
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score
 import xgboost as xgb
 import joblib
+import copy
+import os
 from datetime import datetime
 import logging
 
@@ -19,6 +21,63 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def get_xgb_device():
+    """
+    Pick the device XGBoost should train and predict on
+    
+    Controlled by the STOCKSENSE_XGB_DEVICE environment variable ('cpu', 'cuda'
+    or 'auto'). 'auto' uses CUDA when cupy can see a GPU.
+    
+    Returns:
+        str: 'cuda' or 'cpu'
+    """
+    device = os.environ.get('STOCKSENSE_XGB_DEVICE', 'auto').lower()
+    
+    if device == 'auto':
+        try:
+            import cupy
+            device = 'cuda' if cupy.cuda.runtime.getDeviceCount() > 0 else 'cpu'
+        except Exception:
+            device = 'cpu'
+    
+    return device
+
+# Upper bin edges (right-inclusive) and labels for the engineered category features
+PRICE_BINS = [20, 100, 500]
+PRICE_LABELS = ['Low', 'Medium', 'High', 'Premium']
+DEMAND_BINS = [10, 50, 100]
+DEMAND_LABELS = ['Low', 'Medium', 'High', 'Very High']
+
+def _bin_categories(values, bins, labels):
+    """
+    Bin positive values into labelled categories
+    
+    Equivalent to pd.cut with bins [0, *bins, inf], but computed with np.digitize
+    and wrapped as codes, without building an IntervalIndex.
+    
+    Args:
+        values (ndarray): Values to bin
+        bins (list): Upper edges of all but the last bin
+        labels (list): Category label for each bin
+        
+    Returns:
+        Categorical: Binned values; values <= 0 or NaN are missing
+    """
+    codes = np.digitize(values, bins, right=True).astype(np.int8)
+    codes[~(values > 0)] = -1  # Outside the (0, inf] range, as with pd.cut
+    return pd.Categorical.from_codes(codes, categories=labels)
+
+# Model input columns, in order (only those present in the data are used)
+FEATURE_COLUMNS = [
+    'price', 'supplier_lead_time', 'minimum_stock_level', 'seasonal_factor',
+    'avg_daily_demand', 'demand_std', 'max_daily_demand', 'total_stockouts',
+    'weekend_sales_ratio', 'holiday_sales_ratio', 'current_stock',
+    'days_since_restock', 'demand_variability', 'stock_coverage_days',
+    'category_encoded', 'subcategory_encoded', 'price_category_encoded',
+    'demand_category_encoded', 'stockout_rate', 'is_fast_moving',
+    'lead_time_risk', 'is_seasonal', 'stock_health_score'
+]
+
 class StockSenseModel:
     """
     Machine Learning model for predicting stockout risk
@@ -29,6 +88,7 @@ class StockSenseModel:
         self.scaler = None
         self.encoders = {}
         self.feature_names = []
+        self.device = 'cpu'
         self.is_trained = False
         
     def engineer_features(self, data):
@@ -46,27 +106,25 @@ class StockSenseModel:
         # Handle missing values
         df_features['demand_variability'] = df_features['demand_variability'].fillna(0)
         
-        # Price categories
-        df_features['price_category'] = pd.cut(df_features['price'], 
-                                              bins=[0, 20, 100, 500, float('inf')],
-                                              labels=['Low', 'Medium', 'High', 'Premium'])
+        price = df_features['price'].to_numpy(dtype=np.float64)
+        demand = df_features['avg_daily_demand'].to_numpy(dtype=np.float64)
+        lead_time = df_features['supplier_lead_time'].to_numpy()
         
-        # Demand categories
-        df_features['demand_category'] = pd.cut(df_features['avg_daily_demand'],
-                                               bins=[0, 10, 50, 100, float('inf')],
-                                               labels=['Low', 'Medium', 'High', 'Very High'])
-        
-        # Risk indicators
-        df_features['stockout_rate'] = df_features['total_stockouts'] / 365
-        df_features['is_fast_moving'] = (df_features['avg_daily_demand'] > df_features['avg_daily_demand'].median()).astype(int)
-        df_features['lead_time_risk'] = (df_features['supplier_lead_time'] > 7).astype(int)
-        
-        # Seasonal indicators
-        df_features['is_seasonal'] = (df_features['seasonal_factor'] > 1.5).astype(int)
-        
-        # Stock health metrics
-        df_features['stock_health_score'] = (
-            df_features['stock_coverage_days'] / df_features['supplier_lead_time']
+        df_features = df_features.assign(
+            # Price and demand categories
+            price_category=_bin_categories(price, PRICE_BINS, PRICE_LABELS),
+            demand_category=_bin_categories(demand, DEMAND_BINS, DEMAND_LABELS),
+            
+            # Risk indicators
+            stockout_rate=df_features['total_stockouts'].to_numpy() / 365,
+            is_fast_moving=(demand > np.nanmedian(demand)).astype(np.int8),
+            lead_time_risk=(lead_time > 7).astype(np.int8),
+            
+            # Seasonal indicators
+            is_seasonal=(df_features['seasonal_factor'].to_numpy() > 1.5).astype(np.int8),
+            
+            # Stock health metrics
+            stock_health_score=df_features['stock_coverage_days'].to_numpy() / lead_time
         )
         
         return df_features
@@ -89,31 +147,23 @@ class StockSenseModel:
         
         for col in categorical_cols:
             if fit_encoders:
-                if col not in self.encoders:
-                    self.encoders[col] = LabelEncoder()
-                df_model[f'{col}_encoded'] = self.encoders[col].fit_transform(df_model[col])
+                # Encoders are the fitted category lists; codes index into them
+                categorical = df_model[col].astype('category')
+                self.encoders[col] = categorical.cat.categories
+                df_model[f'{col}_encoded'] = categorical.cat.codes.astype(np.int32)
             else:
                 if col in self.encoders:
-                    # Handle unseen categories
-                    df_model[f'{col}_encoded'] = df_model[col].map(
-                        dict(zip(self.encoders[col].classes_, 
-                                self.encoders[col].transform(self.encoders[col].classes_)))
-                    ).fillna(-1)  # Assign -1 to unseen categories
-        
-        # Select features for modeling
-        feature_cols = [
-            'price', 'supplier_lead_time', 'minimum_stock_level', 'seasonal_factor',
-            'avg_daily_demand', 'demand_std', 'max_daily_demand', 'total_stockouts',
-            'weekend_sales_ratio', 'holiday_sales_ratio', 'current_stock',
-            'days_since_restock', 'demand_variability', 'stock_coverage_days',
-            'category_encoded', 'subcategory_encoded', 'price_category_encoded',
-            'demand_category_encoded', 'stockout_rate', 'is_fast_moving',
-            'lead_time_risk', 'is_seasonal', 'stock_health_score'
-        ]
+                    # Models saved before this change hold LabelEncoders
+                    categories = pd.Index(getattr(self.encoders[col], 'classes_', self.encoders[col]))
+                    # Hash lookup; unseen categories get code -1
+                    df_model[f'{col}_encoded'] = categories.get_indexer(df_model[col]).astype(np.int32)
         
         # Only use columns that exist in the data
-        available_cols = [col for col in feature_cols if col in df_model.columns]
-        X = df_model[available_cols]
+        available_cols = [col for col in FEATURE_COLUMNS if col in df_model.columns]
+        # float32 features (int16 category codes) halve the bytes the models read;
+        # the tree models work in float32 internally anyway
+        dtypes = {col: np.int16 if col.endswith('_encoded') else np.float32 for col in available_cols}
+        X = df_model[available_cols].astype(dtypes)
         
         if fit_encoders:
             self.feature_names = available_cols
@@ -129,8 +179,21 @@ class StockSenseModel:
             target_column (str): Name of target column
             model_type (str): Type of model to train ('random_forest', 'xgboost', 'logistic')
         """
-        logger.info("Starting model training...")
+        X_train, X_test, y_train, y_test = self.split_data(data, target_column)
+        
+        return self.train_from_split(X_train, X_test, y_train, y_test, model_type)
+    
+    def split_data(self, data, target_column='is_high_risk'):
+        """
+        Engineer features, fit the encoders and split into train and test sets
         
+        Args:
+            data (DataFrame): Training data
+            target_column (str): Name of target column
+            
+        Returns:
+            tuple: (X_train, X_test, y_train, y_test)
+        """
         # Feature engineering
         data_engineered = self.engineer_features(data)
         
@@ -139,9 +202,30 @@ class StockSenseModel:
         y = data_engineered[target_column]
         
         # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
+        return train_test_split(
             X, y, test_size=0.2, random_state=42, stratify=y
         )
+    
+    def train_from_split(self, X_train, X_test, y_train, y_test, model_type='random_forest'):
+        """
+        Train the stockout prediction model on an existing split
+        
+        The encoders and feature names must already be fitted, e.g. by split_data
+        on this model or on the model it was copied from.
+        
+        Args:
+            X_train (DataFrame): Training features
+            X_test (DataFrame): Test features
+            y_train (Series): Training target
+            y_test (Series): Test target
+            model_type (str): Type of model to train ('random_forest', 'xgboost', 'logistic')
+        """
+        logger.info("Starting model training...")
+        
+        # Reset what an earlier training run on this instance may have left behind
+        # (the XGBoost device, the logistic model's scaler)
+        self.device = 'cpu'
+        self.scaler = None
         
         # Train model based on type
         if model_type == 'random_forest':
@@ -149,18 +233,28 @@ class StockSenseModel:
                 n_estimators=100,
                 max_depth=10,
                 min_samples_split=5,
+                n_jobs=-1,  # Fit and predict trees in parallel
                 random_state=42
             )
             self.model.fit(X_train, y_train)
             
         elif model_type == 'xgboost':
+            self.device = get_xgb_device()
+            gpu_params = {'predictor': 'gpu_predictor'} if self.device == 'cuda' else {}
+            
+            # The hist methods make fit() build a QuantileDMatrix (features stored as
+            # max_bin quantile bins) instead of a full-precision DMatrix
             self.model = xgb.XGBClassifier(
                 n_estimators=100,
                 max_depth=6,
                 learning_rate=0.1,
-                random_state=42
+                tree_method='gpu_hist' if self.device == 'cuda' else 'hist',
+                max_bin=256,
+                random_state=42,
+                **gpu_params
             )
             self.model.fit(X_train, y_train)
+            logger.info(f"XGBoost trained on {self.device}")
             
         elif model_type == 'logistic':
             self.scaler = StandardScaler()
@@ -211,6 +305,18 @@ class StockSenseModel:
         Returns:
             tuple: (predictions, probabilities)
         """
+        return self.predict_features(self.transform(data))
+    
+    def transform(self, data):
+        """
+        Turn new data into the model's input matrix
+        
+        Args:
+            data (DataFrame): Data to make predictions on
+            
+        Returns:
+            DataFrame or ndarray: Model-ready features
+        """
         if not self.is_trained:
             raise ValueError("Model must be trained before making predictions")
         
@@ -224,9 +330,42 @@ class StockSenseModel:
         if self.scaler:
             X = self.scaler.transform(X)
         
+        return X
+    
+    def predict_features(self, X):
+        """
+        Make predictions on features produced by transform
+        
+        Args:
+            X (DataFrame or ndarray): Model-ready features
+            
+        Returns:
+            tuple: (predictions, probabilities)
+        """
+        if not self.is_trained:
+            raise ValueError("Model must be trained before making predictions")
+        
+        # Keep GPU inference on the device instead of copying from host per call
+        # (only XGBoost accepts cupy input)
+        on_gpu = self.device == 'cuda' and isinstance(self.model, xgb.XGBClassifier)
+        if on_gpu:
+            import cupy
+            X = cupy.asarray(np.asarray(X, dtype=np.float32))
+        
         # Make predictions
-        predictions = self.model.predict(X)
-        probabilities = self.model.predict_proba(X)[:, 1]
+        if isinstance(self.model, xgb.XGBClassifier):
+            # One pass over the trees, without building a DMatrix; the binary
+            # objective gives positive-class probabilities, thresholded as predict does
+            if not on_gpu:
+                X = np.ascontiguousarray(X, dtype=np.float32)
+            probabilities = self.model.get_booster().inplace_predict(X)
+            predictions = (probabilities > 0.5).astype(np.int8)
+        else:
+            predictions = self.model.predict(X)
+            probabilities = self.model.predict_proba(X)[:, 1]
+        
+        if on_gpu:
+            predictions, probabilities = cupy.asnumpy(predictions), cupy.asnumpy(probabilities)
         
         return predictions, probabilities
     
@@ -251,12 +390,14 @@ class StockSenseModel:
             logger.warning("Model does not have feature importance attribute")
             return None
     
-    def save_model(self, filepath):
+    def save_model(self, filepath, compress=0):
         """
         Save trained model to file
         
         Args:
             filepath (str): Path to save model
+            compress (int or tuple): joblib compression, e.g. ('lz4', 3). Compressed
+                files are smaller but cannot be memory-mapped on load
         """
         if not self.is_trained:
             raise ValueError("Model must be trained before saving")
@@ -266,10 +407,13 @@ class StockSenseModel:
             'scaler': self.scaler,
             'encoders': self.encoders,
             'feature_names': self.feature_names,
+            'device': self.device,
             'timestamp': datetime.now().isoformat()
         }
         
-        joblib.dump(model_data, filepath)
+        # joblib stores numpy arrays in its own raw format, which joblib.load(mmap_mode='r')
+        # can memory-map, but only in uncompressed dumps (compress=0)
+        joblib.dump(model_data, filepath, compress=compress)
         logger.info(f"Model saved to {filepath}")
     
     def load_model(self, filepath):
@@ -279,15 +423,29 @@ class StockSenseModel:
         Args:
             filepath (str): Path to load model from
         """
-        model_data = joblib.load(filepath)
+        self.load_model_data(joblib.load(filepath, mmap_mode='r'))
+        
+        logger.info(f"Model loaded from {filepath}")
+    
+    def load_model_data(self, model_data):
+        """
+        Restore a trained model from an already loaded model file
         
+        Args:
+            model_data (dict): Contents of a file written by save_model
+        """
         self.model = model_data['model']
         self.scaler = model_data.get('scaler')
         self.encoders = model_data['encoders']
         self.feature_names = model_data['feature_names']
-        self.is_trained = True
+        self.device = model_data.get('device', 'cpu')
         
-        logger.info(f"Model loaded from {filepath}")
+        # A GPU-trained booster can still be served from a machine without one
+        if self.device == 'cuda' and get_xgb_device() != 'cuda':
+            self.model.set_params(predictor='cpu_predictor')
+            self.device = 'cpu'
+        
+        self.is_trained = True
 
 def main():
     """
@@ -301,28 +459,29 @@ def main():
         logger.error("Training data not found. Please run data_generation.py first.")
         return
     
-    # Initialize and train model
-    stocksense = StockSenseModel()
+    # Engineer features and split once; every candidate model trains on the same split
+    preprocessor = StockSenseModel()
+    split = preprocessor.split_data(data)
     
     # Train different models and compare
     models = ['random_forest', 'xgboost', 'logistic']
     results = {}
+    best_model_type = None
     
     for model_type in models:
         logger.info(f"\nTraining {model_type} model...")
-        stocksense_temp = StockSenseModel()
-        result = stocksense_temp.train(data, model_type=model_type)
+        stocksense_temp = copy.copy(preprocessor)  # Shares the fitted encoders and feature names
+        result = stocksense_temp.train_from_split(*split, model_type=model_type)
         results[model_type] = result
         
         # Save the best model so far
-        if not results or result['auc_score'] > max(r['auc_score'] for r in results.values() if r != result):
+        if best_model_type is None or result['auc_score'] > results[best_model_type]['auc_score']:
             stocksense = stocksense_temp
             best_model_type = model_type
     
     logger.info(f"\nBest model: {best_model_type} with AUC: {results[best_model_type]['auc_score']:.4f}")
     
     # Save the best model
-    import os
     os.makedirs('../models', exist_ok=True)
     stocksense.save_model('../models/stockout_model.pkl')
     
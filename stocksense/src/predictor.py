@@ -6,15 +6,165 @@ Makes predictions using trained model for real-time inventory monitoring
 import pandas as pd
 import numpy as np
 import joblib
+import hashlib
 import logging
+from collections import OrderedDict
+from operator import itemgetter
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 import json
 
+from model import StockSenseModel
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Risk score boundaries and the categories they separate (see _categorize_risk)
+RISK_THRESHOLDS = [0.3, 0.7]
+RISK_CATEGORIES = ['Low Risk', 'Medium Risk', 'High Risk']
+
+# Alerts returned by the dashboard
+MAX_ALERTS = 10
+
+# Number of recent inventory frames whose model features are kept
+FEATURE_CACHE_SIZE = 8
+
+# Product fields read by _generate_recommendations, and their defaults
+PRODUCT_DEFAULTS = {
+    'current_stock': 0,
+    'avg_daily_demand': 1,
+    'supplier_lead_time': 7,
+    'minimum_stock_level': 10,
+}
+_PRODUCT_FIELDS = itemgetter(*PRODUCT_DEFAULTS)
+
+# Recommendation templates per risk band (see _risk_band), as
+# (leading, trailing) messages around the stock level checks
+RISK_BAND_RECOMMENDATIONS = (
+    ((), ("✅ Inventory levels are healthy",
+          "📈 Current stock covers {stock_days:.1f} days of demand")),
+    ((), ()),
+    (("⚠️  Schedule reorder within 24 hours",
+      "📊 Stock coverage: {stock_days:.1f} days"), ()),
+    (("🚨 URGENT: Place emergency order immediately",
+      "📦 Current stock will last only {stock_days:.1f} days"), ()),
+)
+BELOW_MINIMUM_TEMPLATE = "📉 Below minimum stock level ({min_stock} units)"
+BEFORE_DELIVERY_TEMPLATE = "⏰ Stock will run out before next delivery ({lead_time} days)"
+REORDER_TEMPLATE = "📋 Suggested reorder quantity: {reorder_qty} units"
+
+def _risk_band(risk_score: float) -> int:
+    """
+    Recommendation band of a risk score: 0 below 0.3, 1 up to 0.5,
+    2 up to 0.7 and 3 above (NaN scores fall in band 1)
+    """
+    return 1 + (risk_score > 0.5) + (risk_score > 0.7) - (risk_score < 0.3)
+
+def _frame_key(df: pd.DataFrame) -> bytes:
+    """
+    Content hash of a DataFrame (values, column names and dtypes)
+    
+    Args:
+        df (DataFrame): Frame to hash
+        
+    Returns:
+        bytes: 16-byte digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(list(zip(df.columns, df.dtypes))).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.digest()
+
+def _fallback_score(stock: np.ndarray, demand: np.ndarray, lead_time: np.ndarray,
+                    threshold: float = 0.5) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stock-coverage heuristic used when the model can't score products
+    
+    Risk rises as stock coverage (in days of demand) falls below twice the
+    supplier lead time.
+    
+    Args:
+        stock (ndarray): Current stock per product
+        demand (ndarray): Average daily demand per product
+        lead_time (ndarray): Supplier lead time in days per product
+        threshold (float): Risk score above which a product is flagged
+        
+    Returns:
+        tuple: (predictions, probabilities)
+    """
+    stock_days = stock / np.maximum(demand, 1.0)
+    # Unknown coverage (e.g. NaN demand for products with no sales history) counts
+    # as none, so those products score 1.0 as they did when scored row by row
+    coverage = np.nan_to_num(stock_days / (lead_time * 2.0), nan=0.0)
+    probabilities = np.clip(1.0 - coverage, 0.0, 1.0)
+    
+    return (probabilities > threshold).astype(np.int8), probabilities
+
+def _risk_order(probabilities: np.ndarray) -> np.ndarray:
+    """
+    Row order from highest to lowest risk score
+    
+    Ties keep their input order and NaN scores (failed predictions) go last,
+    as with sort_values(ascending=False, kind='stable').
+    
+    Args:
+        probabilities (ndarray): Risk score per product
+        
+    Returns:
+        ndarray: Positions that sort the rows
+    """
+    return np.argsort(-probabilities, kind='stable')
+
+def _aggregate_sales(sales_history: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-product demand statistics from daily sales history
+    
+    Rows are sorted by product once and every statistic is a reduceat over the
+    contiguous per-product runs, instead of separate hash-groupby reductions.
+    
+    Args:
+        sales_history (DataFrame): Daily sales with product_id, daily_demand and stockout
+        
+    Returns:
+        DataFrame: product_id, avg_daily_demand, demand_std, max_daily_demand, total_stockouts
+    """
+    codes, product_ids = pd.factorize(sales_history['product_id'], sort=True)
+    demand = sales_history['daily_demand'].to_numpy()
+    stockouts = sales_history['stockout'].to_numpy()
+    
+    # Missing product ids are dropped, as groupby does
+    valid = codes >= 0
+    if not valid.all():
+        codes, demand, stockouts = codes[valid], demand[valid], stockouts[valid]
+    
+    if len(codes) == 0:
+        return pd.DataFrame(columns=['product_id', 'avg_daily_demand', 'demand_std',
+                                     'max_daily_demand', 'total_stockouts'])
+    
+    # Sales history is usually stored product by product; only sort when it isn't
+    if (codes[1:] < codes[:-1]).any():
+        # Small unsigned codes let numpy use a radix sort
+        sort_keys = codes.astype(np.uint16) if len(product_ids) <= np.iinfo(np.uint16).max else codes
+        order = np.argsort(sort_keys, kind='stable')
+        codes, demand, stockouts = codes[order], demand[order], stockouts[order]
+    
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    counts = np.diff(np.r_[starts, len(codes)])
+    
+    avg_demand = np.add.reduceat(demand, starts, dtype=np.float64) / counts
+    squared_error = np.add.reduceat((demand - np.repeat(avg_demand, counts)) ** 2, starts)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        demand_std = np.sqrt(squared_error / (counts - 1))  # Sample std; NaN for a single day
+    
+    return pd.DataFrame({
+        'product_id': product_ids[codes[starts]],
+        'avg_daily_demand': avg_demand,
+        'demand_std': demand_std,
+        'max_daily_demand': np.maximum.reduceat(demand, starts),
+        'total_stockouts': np.add.reduceat(stockouts, starts)
+    })
+
 class StockSensePredictor:
     """
     Real-time predictor for stockout risk assessment
@@ -29,12 +179,21 @@ class StockSensePredictor:
         """
         self.model_path = model_path
         self.model_data = None
+        self._model = None
+        self._feature_cache = OrderedDict()
         self.load_model()
         
     def load_model(self):
         """Load the trained model and associated components"""
         try:
-            self.model_data = joblib.load(self.model_path)
+            # Model arrays are memory-mapped and paged in on demand (ignored for compressed files)
+            self.model_data = joblib.load(self.model_path, mmap_mode='r')
+            
+            # Built once and reused by every prediction call
+            self._model = StockSenseModel()
+            self._model.load_model_data(self.model_data)
+            self._feature_cache.clear()
+            
             logger.info(f"Model loaded successfully from {self.model_path}")
         except FileNotFoundError:
             logger.error(f"Model file not found: {self.model_path}")
@@ -56,21 +215,26 @@ class StockSensePredictor:
         Returns:
             DataFrame: Prepared data for prediction
         """
-        df = inventory_data.copy()
-        
         # If sales history is provided, aggregate it
-        if sales_history is not None:
-            sales_agg = sales_history.groupby('product_id').agg({
-                'daily_demand': ['mean', 'std', 'max'],
-                'stockout': 'sum'
-            }).reset_index()
-            
-            # Flatten column names
-            sales_agg.columns = [
-                'product_id', 'avg_daily_demand', 'demand_std', 
-                'max_daily_demand', 'total_stockouts'
-            ]
+        sales_agg = _aggregate_sales(sales_history) if sales_history is not None else None
+        
+        return self._prepare_with_sales(inventory_data, sales_agg)
+    
+    def _prepare_with_sales(self, inventory_data: pd.DataFrame,
+                            sales_agg: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        prepare_prediction_data, given sales history already aggregated per product
+        
+        Args:
+            inventory_data (DataFrame): Current inventory levels
+            sales_agg (DataFrame, optional): Output of _aggregate_sales
             
+        Returns:
+            DataFrame: Prepared data for prediction
+        """
+        df = inventory_data.copy()
+        
+        if sales_agg is not None:
             df = df.merge(sales_agg, on='product_id', how='left')
         
         # Fill missing values with defaults if sales history not available
@@ -125,19 +289,7 @@ class StockSensePredictor:
         
         # Make prediction using the loaded model components
         try:
-            # Use the StockSenseModel's prediction logic
-            from model import StockSenseModel
-            
-            # Create temporary model instance and load components
-            temp_model = StockSenseModel()
-            temp_model.model = self.model_data['model']
-            temp_model.scaler = self.model_data.get('scaler')
-            temp_model.encoders = self.model_data['encoders']
-            temp_model.feature_names = self.model_data['feature_names']
-            temp_model.is_trained = True
-            
-            # Make prediction
-            predictions, probabilities = temp_model.predict(df_prepared)
+            predictions, probabilities = self._model.predict(df_prepared)
             
             risk_score = probabilities[0]
             is_high_risk = predictions[0]
@@ -145,11 +297,14 @@ class StockSensePredictor:
         except Exception as e:
             logger.error(f"Error making prediction: {e}")
             # Fallback simple prediction
-            stock_days = product_data.get('current_stock', 0) / max(product_data.get('avg_daily_demand', 1), 1)
-            lead_time = product_data.get('supplier_lead_time', 7)
+            predictions, probabilities = _fallback_score(
+                np.array([product_data.get('current_stock', 0)], dtype=np.float64),
+                np.array([product_data.get('avg_daily_demand', 1)], dtype=np.float64),
+                np.array([product_data.get('supplier_lead_time', 7)], dtype=np.float64)
+            )
             
-            risk_score = max(0, min(1, 1 - (stock_days / (lead_time * 2))))
-            is_high_risk = 1 if risk_score > 0.5 else 0
+            risk_score = probabilities[0]
+            is_high_risk = predictions[0]
         
         # Generate recommendations
         recommendations = self._generate_recommendations(product_data, risk_score)
@@ -177,47 +332,302 @@ class StockSensePredictor:
         """
         logger.info(f"Making batch predictions for {len(inventory_data)} products")
         
-        # Prepare data
-        df_prepared = self.prepare_prediction_data(inventory_data, sales_history)
-        
         try:
-            # Use the loaded model for prediction
-            from model import StockSenseModel
-            
-            temp_model = StockSenseModel()
-            temp_model.model = self.model_data['model']
-            temp_model.scaler = self.model_data.get('scaler')
-            temp_model.encoders = self.model_data['encoders']
-            temp_model.feature_names = self.model_data['feature_names']
-            temp_model.is_trained = True
-            
-            predictions, probabilities = temp_model.predict(df_prepared)
+            X = self._get_features(inventory_data, sales_history)
+            predictions, probabilities = self._model.predict_features(X)
             
         except Exception as e:
             logger.error(f"Error in batch prediction: {e}")
-            # Fallback predictions
-            predictions = []
-            probabilities = []
-            
-            for _, row in df_prepared.iterrows():
-                stock_days = row.get('current_stock', 0) / max(row.get('avg_daily_demand', 1), 1)
-                lead_time = row.get('supplier_lead_time', 7)
-                
-                risk_score = max(0, min(1, 1 - (stock_days / (lead_time * 2))))
-                probabilities.append(risk_score)
-                predictions.append(1 if risk_score > 0.5 else 0)
-        
-        # Add predictions to results
-        results = inventory_data.copy()
+            df_prepared = self.prepare_prediction_data(inventory_data, sales_history)
+            
+            # Fallback predictions, scored for all rows at once
+            n_rows = len(df_prepared)
+            stock = (df_prepared['current_stock'].to_numpy(dtype=np.float64)
+                     if 'current_stock' in df_prepared.columns else np.zeros(n_rows))
+            demand = df_prepared['avg_daily_demand'].to_numpy(dtype=np.float64)
+            lead_time = (df_prepared['supplier_lead_time'].to_numpy(dtype=np.float64)
+                         if 'supplier_lead_time' in df_prepared.columns else np.full(n_rows, 7.0))
+            
+            predictions, probabilities = _fallback_score(stock, demand, lead_time)
+        
+        # Sort by risk score (highest risk first) while building the results, so the
+        # inventory frame is copied once rather than copied and then sorted
+        probabilities = np.asarray(probabilities)
+        predictions = np.asarray(predictions)
+        order = _risk_order(probabilities)
+        probabilities = probabilities[order]
+        predictions = predictions[order]
+        
+        results = inventory_data.take(order)
         results['risk_score'] = probabilities
         results['risk_prediction'] = predictions
-        results['risk_level'] = ['High' if p == 1 else 'Low' for p in predictions]
-        results['risk_category'] = [self._categorize_risk(score) for score in probabilities]
-        results['prediction_timestamp'] = datetime.now().isoformat()
+        results['risk_level'] = np.where(predictions == 1, 'High', 'Low')
+        results['risk_category'] = pd.Categorical.from_codes(
+            np.digitize(probabilities, RISK_THRESHOLDS), categories=RISK_CATEGORIES
+        )
+        
+        # One timestamp for the whole batch: a single-category column plus frame metadata
+        timestamp = datetime.now().isoformat()
+        results['prediction_timestamp'] = pd.Categorical.from_codes(
+            np.zeros(len(results), dtype=np.int8), categories=[timestamp]
+        )
+        results.attrs['prediction_timestamp'] = timestamp
+        
+        logger.info(f"Batch prediction completed. High risk products: {int(np.count_nonzero(predictions))}")
+        
+        return results
+    
+    def _get_features(self, inventory_data: pd.DataFrame,
+                      sales_history: Optional[pd.DataFrame] = None):
+        """
+        Model features for an inventory frame, reused while the frame is unchanged
+        
+        Dashboards poll the same inventory repeatedly, so the prepared features
+        for the most recent frames are cached by content hash. Sales history is
+        aggregated first and only the small per-product aggregate is hashed;
+        hashing the raw daily history would cost more than the work it saves.
+        
+        Args:
+            inventory_data (DataFrame): Current inventory levels
+            sales_history (DataFrame, optional): Historical sales data
+            
+        Returns:
+            DataFrame or ndarray: Model-ready features
+        """
+        key = _frame_key(inventory_data)
+        sales_agg = None
+        if sales_history is not None:
+            sales_agg = _aggregate_sales(sales_history)
+            key += _frame_key(sales_agg)
+        
+        X = self._feature_cache.get(key)
+        if X is not None:
+            self._feature_cache.move_to_end(key)
+            return X
+        
+        X = self._model.transform(self._prepare_with_sales(inventory_data, sales_agg))
+        
+        self._feature_cache[key] = X
+        if len(self._feature_cache) > FEATURE_CACHE_SIZE:
+            self._feature_cache.popitem(last=False)
+        
+        return X
+    
+    def get_high_risk_products(self, inventory_data: pd.DataFrame, 
+                              threshold: float = 0.5) -> pd.DataFrame:
+        """
+        Get products with high stockout risk
         
-        # Sort by risk score (highest risk first)
-        results = results.sort_values('risk_score', ascending=False)
+        Args:
+            inventory_data (DataFrame): Current inventory data
+            threshold (float): Risk threshold for high risk classification
+            
+        Returns:
+            DataFrame: High risk products sorted by risk score
+        """
+        predictions = self.predict_batch(inventory_data)
+        high_risk = predictions[predictions['risk_score'] >= threshold]
         
-        logger.info(f"Batch prediction completed. High risk products: {sum(predictions)}")
+        return high_risk.sort_values('risk_score', ascending=False)
+    
+    def _categorize_risk(self, risk_score: float) -> str:
+        """
+        Categorize risk score into risk levels
         
-        return results\n    \n    def get_high_risk_products(self, inventory_data: pd.DataFrame, \n                              threshold: float = 0.5) -> pd.DataFrame:\n        \"\"\"\n        Get products with high stockout risk\n        \n        Args:\n            inventory_data (DataFrame): Current inventory data\n            threshold (float): Risk threshold for high risk classification\n            \n        Returns:\n            DataFrame: High risk products sorted by risk score\n        \"\"\"\n        predictions = self.predict_batch(inventory_data)\n        high_risk = predictions[predictions['risk_score'] >= threshold]\n        \n        return high_risk.sort_values('risk_score', ascending=False)\n    \n    def _categorize_risk(self, risk_score: float) -> str:\n        \"\"\"\n        Categorize risk score into risk levels\n        \n        Args:\n            risk_score (float): Risk probability score\n            \n        Returns:\n            str: Risk category\n        \"\"\"\n        if risk_score < 0.3:\n            return 'Low Risk'\n        elif risk_score < 0.7:\n            return 'Medium Risk'\n        else:\n            return 'High Risk'\n    \n    def _generate_recommendations(self, product_data: Dict, risk_score: float) -> List[str]:\n        \"\"\"\n        Generate actionable recommendations based on risk assessment\n        \n        Args:\n            product_data (dict): Product information\n            risk_score (float): Calculated risk score\n            \n        Returns:\n            list: List of recommendations\n        \"\"\"\n        recommendations = []\n        \n        current_stock = product_data.get('current_stock', 0)\n        avg_demand = product_data.get('avg_daily_demand', 1)\n        lead_time = product_data.get('supplier_lead_time', 7)\n        min_stock = product_data.get('minimum_stock_level', 10)\n        \n        stock_days = current_stock / max(avg_demand, 1)\n        \n        if risk_score > 0.7:\n            recommendations.append(\"🚨 URGENT: Place emergency order immediately\")\n            recommendations.append(f\"📦 Current stock will last only {stock_days:.1f} days\")\n            \n        elif risk_score > 0.5:\n            recommendations.append(\"⚠️  Schedule reorder within 24 hours\")\n            recommendations.append(f\"📊 Stock coverage: {stock_days:.1f} days\")\n        \n        if current_stock < min_stock:\n            recommendations.append(f\"📉 Below minimum stock level ({min_stock} units)\")\n        \n        if stock_days < lead_time:\n            recommendations.append(f\"⏰ Stock will run out before next delivery ({lead_time} days)\")\n        \n        # Positive recommendations for low risk\n        if risk_score < 0.3:\n            recommendations.append(\"✅ Inventory levels are healthy\")\n            recommendations.append(f\"📈 Current stock covers {stock_days:.1f} days of demand\")\n        \n        # Calculate optimal reorder quantity\n        safety_stock = avg_demand * lead_time * 1.5  # 150% of lead time demand\n        reorder_qty = max(0, safety_stock - current_stock)\n        \n        if reorder_qty > 0:\n            recommendations.append(f\"📋 Suggested reorder quantity: {int(reorder_qty)} units\")\n        \n        return recommendations\n    \n    def generate_dashboard_data(self, inventory_data: pd.DataFrame) -> Dict:\n        \"\"\"\n        Generate comprehensive dashboard data for inventory monitoring\n        \n        Args:\n            inventory_data (DataFrame): Current inventory data\n            \n        Returns:\n            dict: Dashboard data with metrics and insights\n        \"\"\"\n        predictions = self.predict_batch(inventory_data)\n        \n        # Calculate key metrics\n        total_products = len(predictions)\n        high_risk_count = sum(predictions['risk_prediction'])\n        medium_risk_count = sum(predictions['risk_score'].between(0.3, 0.7))\n        low_risk_count = total_products - high_risk_count - medium_risk_count\n        \n        # Risk distribution\n        risk_distribution = {\n            'High Risk': high_risk_count,\n            'Medium Risk': medium_risk_count,\n            'Low Risk': low_risk_count\n        }\n        \n        # Top risk products\n        top_risk_products = predictions.head(10)[[\n            'product_id', 'current_stock', 'avg_daily_demand', \n            'risk_score', 'risk_category'\n        ]].to_dict('records')\n        \n        # Category analysis\n        if 'category' in predictions.columns:\n            category_risk = predictions.groupby('category').agg({\n                'risk_score': 'mean',\n                'risk_prediction': 'sum'\n            }).round(3).to_dict()\n        else:\n            category_risk = {}\n        \n        return {\n            'timestamp': datetime.now().isoformat(),\n            'summary': {\n                'total_products': total_products,\n                'high_risk_products': high_risk_count,\n                'risk_percentage': round(high_risk_count / total_products * 100, 1)\n            },\n            'risk_distribution': risk_distribution,\n            'top_risk_products': top_risk_products,\n            'category_analysis': category_risk,\n            'alerts': self._generate_alerts(predictions)\n        }\n    \n    def _generate_alerts(self, predictions: pd.DataFrame) -> List[Dict]:\n        \"\"\"\n        Generate alerts for immediate attention\n        \n        Args:\n            predictions (DataFrame): Prediction results\n            \n        Returns:\n            list: List of alert dictionaries\n        \"\"\"\n        alerts = []\n        \n        # Critical stock alerts\n        critical_products = predictions[predictions['risk_score'] > 0.8]\n        for _, product in critical_products.iterrows():\n            alerts.append({\n                'type': 'critical',\n                'product_id': product.get('product_id', 'Unknown'),\n                'message': f\"Critical stockout risk: {product['risk_score']:.1%}\",\n                'priority': 'high'\n            })\n        \n        # Low stock alerts\n        if 'current_stock' in predictions.columns and 'minimum_stock_level' in predictions.columns:\n            low_stock = predictions[predictions['current_stock'] < predictions['minimum_stock_level']]\n            for _, product in low_stock.iterrows():\n                alerts.append({\n                    'type': 'low_stock',\n                    'product_id': product.get('product_id', 'Unknown'),\n                    'message': f\"Below minimum stock level\",\n                    'priority': 'medium'\n                })\n        \n        return alerts[:10]  # Limit to top 10 alerts\n\ndef main():\n    \"\"\"\n    Main function for testing the predictor\n    \"\"\"\n    try:\n        # Initialize predictor\n        predictor = StockSensePredictor()\n        \n        # Load sample data\n        inventory_data = pd.read_csv('../data/sample_inventory.csv')\n        \n        logger.info(\"Testing StockSense Predictor...\")\n        \n        # Test single product prediction\n        sample_product = {\n            'product_id': 'TEST001',\n            'current_stock': 15,\n            'avg_daily_demand': 5,\n            'supplier_lead_time': 7,\n            'minimum_stock_level': 20,\n            'price': 25.99,\n            'category': 'Electronics'\n        }\n        \n        single_result = predictor.predict_single_product(sample_product)\n        print(\"\\n📊 Single Product Prediction:\")\n        print(json.dumps(single_result, indent=2))\n        \n        # Test batch prediction\n        if len(inventory_data) > 0:\n            batch_results = predictor.predict_batch(inventory_data.head(5))\n            print(f\"\\n📈 Batch Prediction Results ({len(batch_results)} products):\")\n            print(batch_results[['product_id', 'current_stock', 'risk_score', 'risk_level']].to_string(index=False))\n            \n            # Generate dashboard data\n            dashboard = predictor.generate_dashboard_data(inventory_data.head(10))\n            print(\"\\n📊 Dashboard Summary:\")\n            print(f\"   Total Products: {dashboard['summary']['total_products']}\")\n            print(f\"   High Risk: {dashboard['summary']['high_risk_products']}\")\n            print(f\"   Risk Percentage: {dashboard['summary']['risk_percentage']}%\")\n        \n        logger.info(\"✅ Predictor testing completed successfully!\")\n        \n    except Exception as e:\n        logger.error(f\"Error testing predictor: {e}\")\n        logger.info(\"Make sure to train the model first by running: python model.py\")\n\nif __name__ == \"__main__\":\n    main()"
\ No newline at end of file
+        Args:
+            risk_score (float): Risk probability score
+            
+        Returns:
+            str: Risk category
+        """
+        if risk_score < 0.3:
+            return 'Low Risk'
+        elif risk_score < 0.7:
+            return 'Medium Risk'
+        else:
+            return 'High Risk'
+    
+    def _generate_recommendations(self, product_data: Dict, risk_score: float) -> List[str]:
+        """
+        Generate actionable recommendations based on risk assessment
+        
+        Args:
+            product_data (dict): Product information
+            risk_score (float): Calculated risk score
+            
+        Returns:
+            list: List of recommendations
+        """
+        try:
+            current_stock, avg_demand, lead_time, min_stock = _PRODUCT_FIELDS(product_data)
+        except KeyError:
+            current_stock, avg_demand, lead_time, min_stock = _PRODUCT_FIELDS(
+                {**PRODUCT_DEFAULTS, **product_data})
+        
+        values = {
+            'stock_days': current_stock / max(avg_demand, 1),
+            'min_stock': min_stock,
+            'lead_time': lead_time,
+        }
+        leading, trailing = RISK_BAND_RECOMMENDATIONS[_risk_band(risk_score)]
+        
+        recommendations = [template.format_map(values) for template in leading]
+        
+        if current_stock < min_stock:
+            recommendations.append(BELOW_MINIMUM_TEMPLATE.format_map(values))
+        
+        if values['stock_days'] < lead_time:
+            recommendations.append(BEFORE_DELIVERY_TEMPLATE.format_map(values))
+        
+        recommendations.extend(template.format_map(values) for template in trailing)
+        
+        # Optimal reorder quantity: 150% of lead time demand, less current stock
+        reorder_qty = avg_demand * lead_time * 1.5 - current_stock
+        if reorder_qty > 0:
+            recommendations.append(REORDER_TEMPLATE.format(reorder_qty=int(reorder_qty)))
+        
+        return recommendations
+    
+    def generate_dashboard_data(self, inventory_data: pd.DataFrame) -> Dict:
+        """
+        Generate comprehensive dashboard data for inventory monitoring
+        
+        Args:
+            inventory_data (DataFrame): Current inventory data
+            
+        Returns:
+            dict: Dashboard data with metrics and insights
+        """
+        predictions = self.predict_batch(inventory_data)
+        
+        # Calculate key metrics
+        total_products = len(predictions)
+        high_risk_count = sum(predictions['risk_prediction'])
+        medium_risk_count = sum(predictions['risk_score'].between(0.3, 0.7))
+        low_risk_count = total_products - high_risk_count - medium_risk_count
+        
+        # Risk distribution
+        risk_distribution = {
+            'High Risk': high_risk_count,
+            'Medium Risk': medium_risk_count,
+            'Low Risk': low_risk_count
+        }
+        
+        # Top risk products
+        top_risk_products = predictions.head(10)[[
+            'product_id', 'current_stock', 'avg_daily_demand', 
+            'risk_score', 'risk_category'
+        ]].to_dict('records')
+        
+        # Category analysis
+        if 'category' in predictions.columns:
+            category_risk = predictions.groupby('category').agg({
+                'risk_score': 'mean',
+                'risk_prediction': 'sum'
+            }).round(3).to_dict()
+        else:
+            category_risk = {}
+        
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'summary': {
+                'total_products': total_products,
+                'high_risk_products': high_risk_count,
+                'risk_percentage': round(high_risk_count / total_products * 100, 1)
+            },
+            'risk_distribution': risk_distribution,
+            'top_risk_products': top_risk_products,
+            'category_analysis': category_risk,
+            'alerts': self._generate_alerts(predictions)
+        }
+    
+    def _generate_alerts(self, predictions: pd.DataFrame) -> List[Dict]:
+        """
+        Generate alerts for immediate attention
+        
+        Args:
+            predictions (DataFrame): Prediction results
+            
+        Returns:
+            list: List of alert dictionaries
+        """
+        alerts = []
+        
+        if 'product_id' in predictions.columns:
+            product_ids = predictions['product_id'].to_numpy()
+        else:
+            product_ids = np.full(len(predictions), 'Unknown', dtype=object)
+        
+        # Critical stock alerts; only as many rows as can still be returned are formatted
+        scores = predictions['risk_score'].to_numpy()
+        for i in np.flatnonzero(scores > 0.8)[:MAX_ALERTS]:
+            alerts.append({
+                'type': 'critical',
+                'product_id': product_ids[i],
+                'message': f"Critical stockout risk: {scores[i]:.1%}",
+                'priority': 'high'
+            })
+        
+        # Low stock alerts
+        remaining = MAX_ALERTS - len(alerts)
+        if remaining and 'current_stock' in predictions.columns and 'minimum_stock_level' in predictions.columns:
+            low_stock = predictions['current_stock'].to_numpy() < predictions['minimum_stock_level'].to_numpy()
+            for i in np.flatnonzero(low_stock)[:remaining]:
+                alerts.append({
+                    'type': 'low_stock',
+                    'product_id': product_ids[i],
+                    'message': f"Below minimum stock level",
+                    'priority': 'medium'
+                })
+        
+        return alerts
+
+def main():
+    """
+    Main function for testing the predictor
+    """
+    try:
+        # Initialize predictor
+        predictor = StockSensePredictor()
+        
+        # Load sample data
+        inventory_data = pd.read_csv('../data/sample_inventory.csv')
+        
+        logger.info("Testing StockSense Predictor...")
+        
+        # Test single product prediction
+        sample_product = {
+            'product_id': 'TEST001',
+            'current_stock': 15,
+            'avg_daily_demand': 5,
+            'supplier_lead_time': 7,
+            'minimum_stock_level': 20,
+            'price': 25.99,
+            'category': 'Electronics'
+        }
+        
+        single_result = predictor.predict_single_product(sample_product)
+        print("\n📊 Single Product Prediction:")
+        print(json.dumps(single_result, indent=2))
+        
+        # Test batch prediction
+        if len(inventory_data) > 0:
+            batch_results = predictor.predict_batch(inventory_data.head(5))
+            print(f"\n📈 Batch Prediction Results ({len(batch_results)} products):")
+            print(batch_results[['product_id', 'current_stock', 'risk_score', 'risk_level']].to_string(index=False))
+            
+            # Generate dashboard data
+            dashboard = predictor.generate_dashboard_data(inventory_data.head(10))
+            print("\n📊 Dashboard Summary:")
+            print(f"   Total Products: {dashboard['summary']['total_products']}")
+            print(f"   High Risk: {dashboard['summary']['high_risk_products']}")
+            print(f"   Risk Percentage: {dashboard['summary']['risk_percentage']}%")
+        
+        logger.info("✅ Predictor testing completed successfully!")
+        
+    except Exception as e:
+        logger.error(f"Error testing predictor: {e}")
+        logger.info("Make sure to train the model first by running: python model.py")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Tests for the StockSense explainer
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "stocksense", "src"))
+
+from explainer import StockSenseExplainer
+
+def test_executive_summary_skips_nan_scores():
+    """Unscored products are not counted in any risk bucket, the average or lost sales"""
+    explainer = StockSenseExplainer.__new__(StockSenseExplainer)  # No model needed
+    predictions = pd.DataFrame({
+        'risk_score': [0.9, np.nan, 0.5, 0.1, np.nan],
+        'current_stock': [10.0, 20.0, 30.0, 40.0, 50.0],
+        'price': [2.0, 3.0, 4.0, 5.0, 6.0],
+        'category': ['A', 'A', 'B', 'B', 'C'],
+    })
+    
+    summary = explainer.generate_executive_summary(predictions)
+    
+    overview = summary['overview']
+    assert (overview['high_risk_count'], overview['medium_risk_count'], overview['low_risk_count']) == (1, 1, 1)
+    assert overview['average_risk_score'] == 0.5
+    assert summary['financial_impact']['potential_lost_sales'] == 20.0
+    assert summary['category_analysis']['A'] == 0.9
+
+def test_shap_values_for_gpu_saved_model_on_cpu_host(tmp_path, monkeypatch):
+    """A model saved with the GPU predictor is explained on the CPU when no GPU is used"""
+    xgb = pytest.importorskip("xgboost")
+    import joblib
+    
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((200, 3)), columns=['a', 'b', 'c'])
+    y = (X['a'] + rng.random(200) * 0.2 > 0.6).astype(int)
+    model = xgb.XGBClassifier(n_estimators=5, max_depth=2, tree_method='hist').fit(X, y)
+    model.set_params(predictor='gpu_predictor')  # As train_from_split configures it on CUDA
+    
+    model_path = tmp_path / "model.pkl"
+    joblib.dump({'model': model, 'feature_names': list(X.columns), 'device': 'cuda'}, model_path)
+    monkeypatch.setenv("STOCKSENSE_XGB_DEVICE", "cpu")
+    
+    explainer = StockSenseExplainer(str(model_path))
+    values = explainer.shap_values(X.head(10))
+    
+    assert explainer.model_data['model'].get_params()['predictor'] == 'cpu_predictor'
+    assert values.shape == (10, 3)
+
+def test_explain_batch_matches_explain_prediction():
+    """Batch explanations equal the single-product ones, including for a NaN score"""
+    explainer = StockSenseExplainer.__new__(StockSenseExplainer)  # No model needed
+    predictions = pd.DataFrame({
+        'product_id': ['P0', 'P1', 'P2', 'P3', 'P4'],
+        'risk_score': [0.9, np.nan, 0.4, 0.7, 0.1],
+        'current_stock': [10.0, 20.0, 30.0, 40.0, 50.0],
+        'avg_daily_demand': [5.0, 2.0, 3.0, 0.5, 4.0],
+        'supplier_lead_time': [7.0, 21.0, 7.0, 3.0, 10.0],
+        'demand_std': [1.0, 3.0, 0.5, 0.1, 1.0],
+    })
+    
+    batch = explainer.explain_batch(predictions)
+    single = [explainer.explain_prediction(row, row) for row in predictions.to_dict('records')]
+    
+    by_id = {explanation['product_info']['product_id']: explanation for explanation in single}
+    assert [explanation['product_info']['product_id'] for explanation in batch] == ['P0', 'P3', 'P2', 'P4', 'P1']
+    for explanation in batch:
+        expected = by_id[explanation['product_info']['product_id']]
+        assert explanation['explanation_narrative'] == expected['explanation_narrative']
+        assert explanation['key_factors'] == expected['key_factors']
@@ -0,0 +1,121 @@
+"""
+Tests for the shared OpenAI utilities, run against a local stand-in for the API
+"""
+
+import asyncio
+import base64
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from shared.openai_utils import OpenAIManager
+
+EMBEDDING_DIM = 4
+
+class _FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Answers chat completion and embedding requests with fixed payloads"""
+    protocol_version = "HTTP/1.1"  # Keep-alive, so clients pool their connections
+    
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        
+        if self.path.endswith("/embeddings"):
+            vector = base64.b64encode(np.arange(EMBEDDING_DIM, dtype=np.float32).tobytes()).decode()
+            body = {
+                "object": "list",
+                "model": request["model"],
+                "data": [
+                    {"object": "embedding", "index": i, "embedding": vector}
+                    for i in range(len(request["input"]))
+                ],
+                "usage": {"prompt_tokens": 1, "total_tokens": 1},
+            }
+        else:
+            body = {
+                "id": "chatcmpl-test",
+                "object": "chat.completion",
+                "created": 0,
+                "model": request["model"],
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": request["messages"][-1]["content"]},
+                }],
+            }
+        
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def manager(monkeypatch):
+    """OpenAIManager pointed at a local fake API server"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOpenAIHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}/v1")
+    # A fresh key per test so no clients are shared with other tests' servers
+    yield OpenAIManager(api_key=f"sk-test-{uuid.uuid4().hex}")
+    
+    server.shutdown()
+    server.server_close()
+
+def _user(content):
+    return [{"role": "user", "content": content}]
+
+def test_achat_batch_across_event_loops(manager):
+    """Async calls keep working after the first event loop has closed"""
+    first = asyncio.run(manager.achat_batch([_user("a"), _user("b")]))
+    second = asyncio.run(manager.achat_batch([_user("c"), _user("d")]))
+    
+    assert first == ["a", "b"]
+    assert second == ["c", "d"]
+
+def test_async_methods_after_first_loop_closed(manager):
+    """achat_completion and agenerate_embeddings both work on a second event loop"""
+    asyncio.run(manager.achat_completion(_user("warm-up")))
+    
+    reply = asyncio.run(manager.achat_completion(_user("again")))
+    embeddings = asyncio.run(manager.agenerate_embeddings(["x", "y", "x"]))
+    more = asyncio.run(manager.agenerate_embeddings(["z"]))
+    
+    assert reply == "again"
+    assert embeddings.shape == (3, EMBEDDING_DIM)
+    np.testing.assert_array_equal(embeddings[0], np.arange(EMBEDDING_DIM, dtype=np.float32))
+    assert more.shape == (1, EMBEDDING_DIM)
+
+def test_embedding_cache_is_bounded_lru(manager):
+    """The in-memory embedding cache keeps only the most recently used entries"""
+    small = OpenAIManager(api_key=manager.api_key, embedding_cache_size=2)
+    
+    small.generate_embeddings(["a", "b"])
+    small.generate_embeddings(["a"])       # "a" is now the most recently used
+    small.generate_embeddings(["c"])       # evicts "b"
+    
+    assert small.get_embedding_cache_stats()["size"] == 2
+    small.generate_embeddings(["a", "c"])
+    small.generate_embeddings(["b"])
+    assert small.get_embedding_cache_stats() == {"hits": 3, "misses": 4, "size": 2}
+
+def test_persistent_embedding_cache_closed_and_reused(manager, tmp_path):
+    """Closing the manager flushes the shelf so a new manager can read it"""
+    cache_path = str(tmp_path / "embeddings")
+    
+    with OpenAIManager(api_key=manager.api_key, embedding_cache_path=cache_path) as first:
+        first.generate_embeddings(["a", "b"])
+    assert first._persistent_cache is None
+    
+    with OpenAIManager(api_key=manager.api_key, embedding_cache_path=cache_path) as second:
+        second.generate_embeddings(["a", "b"])
+        assert second.get_embedding_cache_stats()["misses"] == 0
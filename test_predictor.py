@@ -0,0 +1,99 @@
+"""
+Tests for StockSense batch prediction
+"""
+
+import os
+import sys
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("xgboost")  # model.py imports it at module level
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "stocksense", "src"))
+
+from predictor import StockSensePredictor, _risk_order
+
+class _FixedScoreModel:
+    """Stands in for StockSenseModel, returning preset risk scores"""
+    
+    def __init__(self, probabilities):
+        self.probabilities = np.asarray(probabilities, dtype=np.float64)
+    
+    def transform(self, data):
+        return np.zeros((len(data), 1), dtype=np.float32)
+    
+    def predict_features(self, X):
+        return (self.probabilities > 0.5).astype(np.int8), self.probabilities
+
+def _predictor(model=None):
+    """StockSensePredictor with the given model and no model file"""
+    predictor = StockSensePredictor.__new__(StockSensePredictor)
+    predictor.model_path = None
+    predictor.model_data = None
+    predictor._model = model
+    predictor._feature_cache = OrderedDict()
+    return predictor
+
+def _inventory(n):
+    return pd.DataFrame({
+        'product_id': [f"P{i}" for i in range(n)],
+        'current_stock': np.full(n, 50.0),
+        'supplier_lead_time': np.full(n, 7.0),
+    })
+
+def test_risk_order_ties_and_nan():
+    """Highest risk first, ties in input order, NaN scores last"""
+    probabilities = np.array([0.2, np.nan, 0.9, 0.2, 0.9, np.nan, 0.5])
+    
+    expected = pd.Series(probabilities).sort_values(ascending=False, kind='stable').index
+    np.testing.assert_array_equal(_risk_order(probabilities), expected)
+    np.testing.assert_array_equal(_risk_order(probabilities), [2, 4, 6, 0, 3, 1, 5])
+
+def test_predict_batch_ranks_nan_scores_last():
+    """A product the model failed to score is not ranked as the highest risk"""
+    predictor = _predictor(_FixedScoreModel([0.4, np.nan, 0.8, 0.4, 0.8]))
+    
+    results = predictor.predict_batch(_inventory(5))
+    
+    assert list(results['product_id']) == ['P2', 'P4', 'P0', 'P3', 'P1']
+    assert np.isnan(results['risk_score'].iloc[-1])
+
+def test_fallback_flags_products_without_sales_history():
+    """Products missing from the sales history are scored 1.0 by the fallback"""
+    predictor = _predictor(model=None)  # No model, so predict_batch falls back
+    sales_history = pd.DataFrame({
+        'product_id': ['P0', 'P0', 'P1', 'P1'],
+        'daily_demand': [20.0, 30.0, 1.0, 1.0],
+        'stockout': [0, 1, 0, 0],
+    })
+    
+    results = predictor.predict_batch(_inventory(3), sales_history).set_index('product_id')
+    
+    assert results.loc['P2', 'risk_score'] == 1.0
+    assert results.loc['P2', 'risk_prediction'] == 1
+    assert results.loc['P1', 'risk_score'] == 0.0
+    assert 0.0 < results.loc['P0', 'risk_score'] < 1.0
+
+def test_feature_cache_follows_sales_history():
+    """Cached features are reused for the same data and rebuilt when sales change"""
+    model = _FixedScoreModel([0.2, 0.8])
+    calls = []
+    transform = model.transform
+    model.transform = lambda data: calls.append(len(data)) or transform(data)
+    predictor = _predictor(model)
+    sales_history = pd.DataFrame({
+        'product_id': ['P0', 'P1'],
+        'daily_demand': [5.0, 8.0],
+        'stockout': [0, 0],
+    })
+    
+    predictor.predict_batch(_inventory(2), sales_history)
+    predictor.predict_batch(_inventory(2), sales_history.copy())
+    assert len(calls) == 1
+    
+    sales_history.loc[1, 'daily_demand'] = 9.0
+    predictor.predict_batch(_inventory(2), sales_history)
+    assert len(calls) == 2